@@ -0,0 +1,114 @@
+from concurrent.futures import ProcessPoolExecutor
+from read_config_file import MazeConfig, read_config
+from mazegen import MazeGenerator
+from mazegen.mazegen import ALGORITHMS
+from mazegen.pattern import load_pattern
+from mazegen.solvers import SOLVERS
+from typing import Any
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+
+def build_maze(job: tuple[MazeConfig, int, str, str, bytes | None, bool]) \
+        -> tuple[int, str, int, dict[str, Any] | None]:
+    """Generate and solve one maze, returning its seed, its text in the
+    hexadecimal output format, its number of cells and, when asked, its
+    analysis metrics."""
+    config, seed, algo, solver, mask, analyze = job
+    maze = MazeGenerator(
+        config.width, config.height, config.entry, config.exit,
+        config.perfect, seed, False, config.braid, mask=mask
+    )
+    maze.generate(algo)
+    path = maze.solve(solver)
+    output = io.StringIO()
+    maze.write_hex(output, maze.Drawing_solution_path(path))
+    stats = maze.analyze().as_dict() if analyze else None
+    return seed, output.getvalue(), maze.width * maze.height, stats
+
+
+def output_name(filename: str, seed: int) -> str:
+    """Insert the seed before the extension of ``filename``."""
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}_{seed}{ext}"
+
+
+def main() -> None:
+    """Generate and solve a batch of mazes across worker processes."""
+    parser = argparse.ArgumentParser(
+        description="Generate many mazes in parallel.")
+    parser.add_argument("config", help="maze configuration file")
+    parser.add_argument("-n", "--count", type=int, default=1,
+                        help="number of mazes to generate")
+    parser.add_argument("--seed-start", type=int, default=0,
+                        help="seed of the first maze, then +1 per maze")
+    parser.add_argument("--algo", default="dfs", choices=ALGORITHMS)
+    parser.add_argument("--solver", default="bfs", choices=list(SOLVERS))
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--shard", action="store_true",
+                        help="write every maze into OUTPUT_FILE, one "
+                        "block per maze separated by an empty line")
+    parser.add_argument("--stats", metavar="FILE",
+                        help="write the analysis metrics of every maze "
+                        "to FILE, one JSON object per line")
+    args = parser.parse_args()
+
+    config = read_config(args.config)
+    mask = None
+    if config.pattern is not None:
+        try:
+            mask = bytes(load_pattern(config.pattern, config.width,
+                                      config.height))
+        except (OSError, ValueError) as problem:
+            print(f"Error: cannot load pattern {config.pattern}: {problem}")
+            sys.exit(1)
+    check = MazeGenerator(config.width, config.height, config.entry,
+                          config.exit, True, mask=mask)
+    if check.is_blocked(*config.entry) or check.is_blocked(*config.exit):
+        print("Error: the entry or exit points is in the 42 walls")
+        sys.exit(1)
+
+    jobs = [(config, seed, args.algo, args.solver, mask,
+             args.stats is not None)
+            for seed in range(args.seed_start,
+                              args.seed_start + args.count)]
+    shard = open(config.output_file, "w") if args.shard else None
+    metrics = open(args.stats, "w") if args.stats is not None else None
+    started = time.perf_counter()
+    done = 0
+    cells = 0
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            chunk = max(1, len(jobs) // (4 * (args.workers or 1)))
+            for seed, text, size, stats in pool.map(build_maze, jobs,
+                                                    chunksize=chunk):
+                if metrics is not None:
+                    metrics.write(json.dumps({"seed": seed, **(stats or {})})
+                                  + "\n")
+                if shard is not None:
+                    shard.write(("\n\n" if done else "") + text)
+                else:
+                    name = output_name(config.output_file, seed)
+                    with open(name, "w") as output:
+                        output.write(text)
+                done += 1
+                cells += size
+                elapsed = time.perf_counter() - started
+                print(f"\r{done}/{len(jobs)} mazes  "
+                      f"{done / elapsed:.1f} mazes/s  "
+                      f"{cells / elapsed:,.0f} cells/s",
+                      end="", file=sys.stderr)
+    finally:
+        if shard is not None:
+            shard.close()
+        if metrics is not None:
+            metrics.close()
+    print(file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
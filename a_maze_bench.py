@@ -0,0 +1,192 @@
+from mazegen import MazeGenerator
+from typing import Any, Callable
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+
+SIZES = [10, 50, 100, 250, 500, 1000, 2000]
+SEED = 42
+
+
+def build(size: int, algo: str, perfect: bool) -> MazeGenerator:
+    """Generate a seeded square maze with corner entry and exit."""
+    maze = MazeGenerator(size, size, (0, 0), (size - 1, size - 1),
+                         perfect, SEED)
+    maze.generate(algo)
+    return maze
+
+
+def bench_generate(algo: str,
+                   perfect: bool) -> Callable[[int], Callable[[], Any]]:
+    """Time building and carving a maze from scratch."""
+    def prepare(size: int) -> Callable[[], Any]:
+        return lambda: build(size, algo, perfect)
+    return prepare
+
+
+def bench_solve(size: int) -> Callable[[], Any]:
+    """Time a breadth-first solve; reloading the walls drops the cached
+    distance field so every run searches again."""
+    maze = build(size, "dfs", True)
+    cells = bytes(maze.cells)
+
+    def run() -> Any:
+        maze.load_cells(cells)
+        return maze.Generate_solution_bfs()
+    return run
+
+
+def bench_draw(size: int) -> Callable[[], Any]:
+    """Time a full terminal frame written to the null device."""
+    maze = build(size, "dfs", True)
+    path = maze.Generate_solution_bfs()
+
+    def run() -> None:
+        with open(os.devnull, "w") as sink:
+            with contextlib.redirect_stdout(sink):
+                maze.draw_maze("\033[37m", path)
+    return run
+
+
+def bench_hex(size: int) -> Callable[[], Any]:
+    """Time the hexadecimal output writer."""
+    maze = build(size, "dfs", True)
+    directions = maze.Drawing_solution_path(maze.Generate_solution_bfs())
+
+    def run() -> None:
+        with open(os.devnull, "w") as sink:
+            maze.write_hex(sink, directions)
+    return run
+
+
+CASES: dict[str, Callable[[int], Callable[[], Any]]] = {
+    "generate dfs perfect": bench_generate("dfs", True),
+    "generate dfs imperfect": bench_generate("dfs", False),
+    "generate prim perfect": bench_generate("prim", True),
+    "generate prim imperfect": bench_generate("prim", False),
+    "solve bfs": bench_solve,
+    "draw_maze": bench_draw,
+    "write_hex": bench_hex,
+}
+
+
+def best_time(run: Callable[[], Any], budget: float) -> float:
+    """Repeat ``run`` until ``budget`` seconds are spent (at least once)
+    and return the fastest run."""
+    best = math.inf
+    spent = 0.0
+    while spent < budget or best == math.inf:
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        best = min(best, elapsed)
+        spent += elapsed
+    return best
+
+
+def peak_memory(run: Callable[[], Any]) -> int:
+    """Return the peak bytes allocated by one traced run of ``run``."""
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def compare(results: list[dict[str, Any]], baseline: dict[str, Any],
+            tolerance: float) -> int:
+    """Print every case next to its baseline and return how many got
+    slower or bigger than ``tolerance`` allows."""
+    known = {(row["case"], row["size"]): row for row in baseline["results"]}
+    regressions = 0
+    for row in results:
+        old = known.get((row["case"], row["size"]))
+        if old is None:
+            continue
+        notes = []
+        for field in ("seconds", "peak_bytes"):
+            if row.get(field) is None or not old.get(field):
+                continue
+            ratio = row[field] / old[field]
+            if ratio > 1 + tolerance:
+                notes.append(f"{field} x{ratio:.2f}")
+        speed = row["seconds"] / old["seconds"] if old["seconds"] else 1.0
+        status = "REGRESSION " + ", ".join(notes) if notes else "ok"
+        print(f"{row['case']:<24}{row['size']:>6}  x{speed:5.2f}  {status}")
+        regressions += bool(notes)
+    return regressions
+
+
+def main() -> None:
+    """Run the benchmark ladder, save it as JSON and compare it with a
+    baseline when one is given."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark maze generation, solving and output.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES,
+                        help="square maze sizes to run")
+    parser.add_argument("--cases", nargs="+", default=list(CASES),
+                        choices=list(CASES), metavar="CASE",
+                        help="cases to run (default: all)")
+    parser.add_argument("--budget", type=float, default=0.5,
+                        help="seconds to spend repeating each case")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the tracemalloc pass")
+    parser.add_argument("--output", default="bench.json",
+                        help="where to write the JSON results")
+    parser.add_argument("--baseline",
+                        help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown before a case fails")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        for case in args.cases:
+            print(f"\r{case} {size}x{size}".ljust(40), end="",
+                  file=sys.stderr)
+            run = CASES[case](size)
+            row: dict[str, Any] = {
+                "case": case,
+                "size": size,
+                "seconds": best_time(run, args.budget),
+                "peak_bytes": None if args.no_memory else peak_memory(run),
+            }
+            results.append(row)
+    print(file=sys.stderr)
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": SEED,
+        "results": results,
+    }
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=1)
+    for row in results:
+        peak = row["peak_bytes"]
+        memory = "" if peak is None else f"{peak / (1 << 20):10.1f} MiB"
+        print(f"{row['case']:<24}{row['size']:>6}"
+              f"{row['seconds']:12.5f} s{memory}")
+
+    if args.baseline is None:
+        return
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}, run `make bench-baseline`")
+        return
+    with open(args.baseline) as source:
+        baseline = json.load(source)
+    print(f"\ncompared with {args.baseline}:")
+    if compare(results, baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
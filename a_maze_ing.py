@@ -1,5 +1,13 @@
 from read_config_file import read_config
 from mazegen import MazeGenerator
+from mazegen.cache import MazeCache
+from mazegen.packed import write_maze
+from mazegen.pattern import load_pattern
+from mazegen.profiling import Profile
+from mazegen.steps import save_steps
+from mazegen.vectorized import HAVE_NUMPY
+import atexit
+import os
 import random
 import sys
 
@@ -16,77 +24,106 @@ def intro() -> None:
     print("\033[0m")
 
 
-data = read_config()
+def dump_profile(profile: Profile, filename: str) -> None:
+    with open(filename, "w") as stats:
+        profile.dump(stats)
+
 
 if __name__ == "__main__":
+    data = read_config()
     end = False
     Ganerate_again = 2
     retry = 0
     color = "\033[37m"
     show_path = True
-    width = data["WIDTH"]
-    height = data["HEIGHT"]
-    entry = data["ENTRY"]
-    exit_point = data["EXIT"]
-    perfect = data["PERFECT"]
-    seed = data["SEED"]
-    anim = data["ANIMATE"]
+    width = data.width
+    height = data.height
+    entry = data.entry
+    exit_point = data.exit
+    perfect = data.perfect
+    seed = data.seed
+    anim = data.animate
+    braid = data.braid
     directions = []
+    profile = Profile() if data.profile else None
+    if profile is not None:
+        atexit.register(dump_profile, profile, data.profile_file)
+    cache = None
+    if data.cache_dir is not None and not anim:
+        cache = MazeCache(data.cache_dir, data.cache_size << 20)
+    mask = None
+    if data.pattern is not None:
+        try:
+            mask = load_pattern(data.pattern, width, height)
+        except (OSError, ValueError) as problem:
+            print(f"Error: cannot load pattern {data.pattern}: {problem}")
+            sys.exit(1)
+    algo = "dfs"
+    maze = MazeGenerator(width, height, entry, exit_point, perfect, seed,
+                         anim, braid, profile, mask)
+    algorithms = [("dfs", "DFS"), ("prim", "PRIM'S"), ("eller", "ELLER'S")]
+    if HAVE_NUMPY:
+        algorithms += [("binary_tree", "BINARY TREE (numpy)"),
+                       ("sidewinder", "SIDEWINDER (numpy)")]
+    algorithms.append(("wilson", "WILSON'S (uniform)"))
 
     intro()
     print("Welcome to our maze Game ;)\n")
     input("\nPress ENTER to start the game...")
 
     while not end:
-        if Ganerate_again == 2 or Ganerate_again == 3:
+        if Ganerate_again == 2:
             if retry == 0:
                 maze_seed = seed
             else:
                 maze_seed = None
-            maze = MazeGenerator(
-                width, height, entry, exit_point, perfect, maze_seed, anim
-            )
-            if Ganerate_again == 2:
-                maze.generate("dfs")
-            elif Ganerate_again == 3:
-                maze.generate("prim")
+            solution = None
+            if cache is not None:
+                maze.reset(maze_seed)
+                solution = cache.generate(maze, algo)
+            else:
+                maze.regenerate(maze_seed, algo)
             print('\033c', end="")
-            path = maze.Draw_42()
-            if path is not None:
-                if entry[::-1] in path or exit_point[::-1] in path:
-                    print("Error: the entry or exit points is in the 42 walls")
-                    sys.exit(1)
+            if maze.is_blocked(*entry) or maze.is_blocked(*exit_point):
+                print("Error: the entry or exit points is in the 42 walls")
+                sys.exit(1)
             maze.display_maze(color, None)
-            path = maze.Generate_solution_bfs()
+            if solution is not None:
+                path = solution
+            else:
+                path = maze.Generate_solution_bfs()
             directions = maze.Drawing_solution_path(path)
             Ganerate_again = 1
-        with open(data["OUTPUT_FILE"], "w+") as output:
-            for i in range(maze.height):
-                for x in maze.grid[i]:
-                    output.write(hex(x.walls).upper()[2:])
-                output.write("\n")
-            output.write("\n")
-            output.write(f"{maze.entry[0]},{maze.entry[1]}\n")
-            output.write(f"{maze.exit[0]},{maze.exit[1]}\n")
-            output.write(''.join(directions))
+            if data.output_format == "packed":
+                with open(data.output_file, "wb") as packed:
+                    write_maze(packed, maze, directions)
+            else:
+                with open(data.output_file, "w+") as output:
+                    maze.write_hex(output, directions)
+            steps_file = os.path.splitext(data.output_file)[0] + ".steps"
+            if maze.generation_steps:
+                save_steps(steps_file, maze.generation_steps)
+            elif os.path.exists(steps_file):
+                os.remove(steps_file)
         print("\n=== A-Maze-ing ===")
         print("1. Re-generate a new maze")
         print("2. Show/Hide path from entry to exit")
         print("3. Rotate maze colors")
-        print("4. Quit")
+        print("4. Replay the generation")
+        print("5. Quit")
         try:
-            choice = int(input("Choice? (1-4): "))
+            choice = int(input("Choice? (1-5): "))
             print()
             if choice == 1:
                 show_path = True
                 retry += 1
-                print("Avalaible algorithm's\n1- DFS")
-                print("2- PRIM'S")
+                print("Avalaible algorithm's")
+                for number, (_, label) in enumerate(algorithms, 1):
+                    print(f"{number}- {label}")
                 choice = int(input("Chose your algorithm :) "))
-                if choice == 1:
+                if 1 <= choice <= len(algorithms):
+                    algo = algorithms[choice - 1][0]
                     Ganerate_again = 2
-                elif choice == 2:
-                    Ganerate_again = 3
                 else:
                     print("choice unavailable")
                 print('\033c', end="")
@@ -110,6 +147,13 @@ if __name__ == "__main__":
                 else:
                     maze.display_maze(color, None)
             elif choice == 4:
+                print('\033c', end="")
+                if maze.generation_steps:
+                    maze.replay(color, None if show_path else path)
+                else:
+                    maze.draw_maze(color, None if show_path else path)
+                    print("\n== no recorded generation to replay ==")
+            elif choice == 5:
                 end = True
             else:
                 print("\n== choice unavailable :( ===\n")
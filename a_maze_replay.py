@@ -0,0 +1,35 @@
+from mazegen.loader import load_hex
+from mazegen.steps import load_steps
+import argparse
+import sys
+
+
+def main() -> None:
+    """Replay the generation of a maze file from its saved step log."""
+    parser = argparse.ArgumentParser(
+        description="Replay the generation of a maze in the terminal.")
+    parser.add_argument("maze", help="maze file in the output format")
+    parser.add_argument("steps", help="step log saved next to it")
+    parser.add_argument("--delay", type=float, default=0.01,
+                        help="seconds per step")
+    parser.add_argument("--start", type=int, default=0,
+                        help="step to jump to before playing")
+    parser.add_argument("--stop", type=int, default=None,
+                        help="step to stop playing at")
+    args = parser.parse_args()
+    try:
+        maze, path = load_hex(args.maze)
+        log = load_steps(args.steps)
+    except (OSError, ValueError) as problem:
+        print(f"Error: {problem}")
+        sys.exit(1)
+    if (log.width, log.height) != (maze.width, maze.height):
+        print("Error: the step log does not match the maze size")
+        sys.exit(1)
+    maze.generation_steps = log
+    maze.replay("\033[37m", path, args.delay, start=args.start,
+                stop=args.stop)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from dataclasses import replace
+from read_config_file import MazeConfig, parse_config_text
+from mazegen import MazeGenerator
+from mazegen.mazegen import ALGORITHMS
+from mazegen.pattern import load_pattern
+from mazegen.solvers import SOLVERS
+from typing import Any
+import argparse
+import asyncio
+import io
+import json
+import os
+import signal
+import time
+
+
+LINE_LIMIT = 64 << 20
+
+
+def run_job(job: tuple[str, MazeConfig, int | None, str, str]) -> str:
+    """Generate a maze in a worker process and return it in the
+    hexadecimal output format, with the solution for "solve" jobs."""
+    op, config, seed, algo, solver = job
+    mask = None
+    if config.pattern is not None:
+        mask = load_pattern(config.pattern, config.width, config.height)
+    maze = MazeGenerator(
+        config.width, config.height, config.entry, config.exit,
+        config.perfect, seed, False, config.braid, mask=mask
+    )
+    if maze.is_blocked(*config.entry) or maze.is_blocked(*config.exit):
+        raise ValueError("the entry or exit points is in the 42 walls")
+    maze.generate(algo)
+    directions: list[str] = []
+    if op == "solve":
+        directions = maze.Drawing_solution_path(maze.solve(solver))
+    output = io.StringIO()
+    maze.write_hex(output, directions)
+    return output.getvalue()
+
+
+def percentile(ordered: list[float], share: float) -> float:
+    """Return the ``share`` (0 to 1) percentile of sorted values."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+class MazeService:
+    """Serve generate and solve jobs as JSON lines over a local socket.
+
+    Jobs go through a bounded queue to a fixed number of dispatchers,
+    each running one job at a time on the process pool, so a full queue
+    holds new requests back instead of piling work up. Identical
+    requests (op, config, seed, algorithm, solver) that arrive while one
+    is queued or running share its result."""
+
+    def __init__(self, pool: ProcessPoolExecutor, workers: int,
+                 queue_size: int = 64, window: int = 10000,
+                 pattern_dir: str | None = None) -> None:
+        """Use ``pool`` with ``workers`` dispatchers and keep the last
+        ``window`` latencies for the percentiles. Requests may only name
+        ``PATTERN`` files inside ``pattern_dir``, and none without it."""
+        self.pool = pool
+        self.pattern_dir = pattern_dir
+        self.workers = workers
+        self.queue: asyncio.Queue[
+            tuple[tuple[str, MazeConfig, int | None, str, str],
+                  asyncio.Future[str]]] = asyncio.Queue(queue_size)
+        self.in_flight: dict[str, asyncio.Future[str]] = {}
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.served = 0
+        self.coalesced = 0
+
+    def resolve_pattern(self, name: str) -> str:
+        """Return the path of pattern file ``name`` inside the allowed
+        directory, refusing anything that resolves outside it."""
+        if self.pattern_dir is None:
+            raise ValueError("PATTERN is not allowed by this server")
+        root = os.path.realpath(self.pattern_dir)
+        path = os.path.realpath(os.path.join(root, name))
+        if os.path.commonpath([root, path]) != root:
+            raise ValueError(f"PATTERN {name} is outside the pattern "
+                             f"directory")
+        return path
+
+    async def dispatch(self) -> None:
+        """Run queued jobs on the pool one at a time."""
+        loop = asyncio.get_running_loop()
+        while True:
+            job, future = await self.queue.get()
+            try:
+                result = await loop.run_in_executor(self.pool, run_job, job)
+            except Exception as problem:
+                future.set_exception(problem)
+            else:
+                future.set_result(result)
+            finally:
+                self.queue.task_done()
+
+    async def enqueue(
+            self,
+            request: dict[str, Any]
+            ) -> tuple[asyncio.Future[str], bool]:
+        """Queue the job of ``request``, waiting while the queue is full,
+        and return the future of its maze text. The flag tells whether
+        the future is shared with an identical request in flight."""
+        op = request.get("op", "generate")
+        if op not in ("generate", "solve"):
+            raise ValueError(f"unknown op: {op}")
+        config = parse_config_text(request["config"])
+        if config.pattern is not None:
+            config = replace(config,
+                             pattern=self.resolve_pattern(config.pattern))
+        seed = request.get("seed", config.seed)
+        algo = request.get("algo", "dfs")
+        solver = request.get("solver", "bfs")
+        if algo not in ALGORITHMS:
+            raise ValueError(f"unknown algorithm: {algo}")
+        if solver not in SOLVERS:
+            raise ValueError(f"unknown solver: {solver}")
+        key = repr((op, config, seed, algo, solver))
+        future = self.in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return future, True
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[key] = future
+        future.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        await self.queue.put(((op, config, seed, algo, solver), future))
+        return future, False
+
+    def stats(self) -> dict[str, Any]:
+        """Return the request counters and latency percentiles."""
+        ordered = sorted(self.latencies)
+        return {
+            "served": self.served,
+            "coalesced": self.coalesced,
+            "queued": self.queue.qsize(),
+            "in_flight": len(self.in_flight),
+            "workers": self.workers,
+            "p50": percentile(ordered, 0.50),
+            "p90": percentile(ordered, 0.90),
+            "p99": percentile(ordered, 0.99),
+        }
+
+    async def handle(self, reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter) -> None:
+        """Answer every request line of a connection.
+
+        The next line is only read once the current job is queued, so a
+        full queue stalls the client. Replies are sent as jobs finish,
+        carrying the request ``id``."""
+        pending: set[asyncio.Task[None]] = set()
+
+        async def send(answer: dict[str, Any]) -> None:
+            if not writer.is_closing():
+                writer.write(json.dumps(answer).encode() + b"\n")
+                await writer.drain()
+
+        async def reply(ident: Any, future: asyncio.Future[str],
+                        shared: bool, started: float) -> None:
+            try:
+                text = await asyncio.shield(future)
+            except Exception as problem:
+                await send({"ok": False, "id": ident,
+                            "error": str(problem) or repr(problem)})
+                return
+            elapsed = time.perf_counter() - started
+            self.latencies.append(elapsed)
+            self.served += 1
+            await send({"ok": True, "id": ident, "maze": text,
+                        "coalesced": shared, "seconds": elapsed})
+
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                started = time.perf_counter()
+                ident = None
+                try:
+                    request = json.loads(line)
+                    ident = request.get("id")
+                    if request.get("op") == "stats":
+                        await send({"ok": True, "id": ident,
+                                    **self.stats()})
+                        continue
+                    future, shared = await self.enqueue(request)
+                except Exception as problem:
+                    await send({"ok": False, "id": ident,
+                                "error": str(problem) or repr(problem)})
+                    continue
+                task = asyncio.create_task(
+                    reply(ident, future, shared, started))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            await asyncio.gather(*pending)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(path: str, workers: int, queue_size: int,
+                pattern_dir: str | None = None) -> None:
+    """Listen on the Unix socket ``path`` until cancelled or sent
+    SIGTERM."""
+    task = asyncio.current_task()
+    if task is not None:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM,
+                                                      task.cancel)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        service = MazeService(pool, workers, queue_size,
+                              pattern_dir=pattern_dir)
+        dispatchers = [asyncio.create_task(service.dispatch())
+                       for _ in range(workers)]
+        server = await asyncio.start_unix_server(service.handle, path,
+                                                 limit=LINE_LIMIT)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for dispatcher in dispatchers:
+                dispatcher.cancel()
+            if os.path.exists(path):
+                os.remove(path)
+
+
+async def ask(path: str, request: dict[str, Any]) -> dict[str, Any]:
+    """Send one request to a running service and return its reply."""
+    reader, writer = await asyncio.open_unix_connection(path,
+                                                        limit=LINE_LIMIT)
+    try:
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        reply: dict[str, Any] = json.loads(await reader.readline())
+        return reply
+    finally:
+        writer.close()
+
+
+def main() -> None:
+    """Run the maze service."""
+    parser = argparse.ArgumentParser(
+        description="Serve maze generation over a local socket.")
+    parser.add_argument("--socket", default="a_maze.sock",
+                        help="path of the Unix socket to listen on")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--queue", type=int, default=64,
+                        help="jobs waiting for a worker before new "
+                        "requests are held back")
+    parser.add_argument("--patterns", metavar="DIR",
+                        help="directory of the pattern files requests may "
+                        "name with PATTERN (none are allowed without it)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.socket, args.workers, args.queue,
+                          args.patterns))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+from mazegen.eller import write_stream
+import argparse
+import sys
+
+
+def main() -> None:
+    """Stream an Eller maze of any height to a file or standard output,
+    keeping only one row in memory."""
+    parser = argparse.ArgumentParser(
+        description="Stream a maze in the hexadecimal output format.")
+    parser.add_argument("width", type=int)
+    parser.add_argument("height", type=int)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default="-",
+                        help="output file, '-' for standard output")
+    args = parser.parse_args()
+    entry = (0, 0)
+    exit_point = (args.width - 1, args.height - 1)
+    if args.output == "-":
+        write_stream(sys.stdout, args.width, args.height, entry, exit_point,
+                     args.seed)
+        return
+    with open(args.output, "w") as output:
+        write_stream(output, args.width, args.height, entry, exit_point,
+                     args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+from read_config_file import read_config
+from mazegen import MazeGenerator
+from mazegen.packed import write_maze
+from mazegen.pattern import load_pattern
+from mazegen.tiled import TILED_ALGOS, generate_tiled
+import argparse
+import os
+import sys
+import time
+
+
+def main() -> None:
+    """Carve one giant maze tile by tile on all cores and write it to
+    OUTPUT_FILE."""
+    parser = argparse.ArgumentParser(
+        description="Generate a huge maze in parallel tiles.")
+    parser.add_argument("config", help="maze configuration file")
+    parser.add_argument("--algo", default="dfs", choices=TILED_ALGOS)
+    parser.add_argument("--tile", type=int, default=512,
+                        help="side of the square tiles, in cells")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--no-solve", action="store_true",
+                        help="leave the solution line empty")
+    args = parser.parse_args()
+    if args.tile < 1 or (args.workers is not None and args.workers < 1):
+        parser.error("--tile and --workers must be at least 1")
+
+    config = read_config(args.config)
+    mask = None
+    if config.pattern is not None:
+        try:
+            mask = load_pattern(config.pattern, config.width, config.height)
+        except (OSError, ValueError) as problem:
+            print(f"Error: cannot load pattern {config.pattern}: {problem}")
+            sys.exit(1)
+    maze = MazeGenerator(
+        config.width, config.height, config.entry, config.exit,
+        config.perfect, config.seed, False, config.braid, mask=mask
+    )
+    if maze.is_blocked(*config.entry) or maze.is_blocked(*config.exit):
+        print("Error: the entry or exit points is in the 42 walls")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    generate_tiled(maze, args.algo, args.tile, args.workers)
+    carved = time.perf_counter()
+    print(f"carved {maze.width * maze.height:,} cells in "
+          f"{carved - started:.2f}s", file=sys.stderr)
+    directions: list[str] = []
+    if not args.no_solve:
+        directions = maze.Drawing_solution_path(maze.Generate_solution_bfs())
+        print(f"solved in {time.perf_counter() - carved:.2f}s",
+              file=sys.stderr)
+    if config.output_format == "packed":
+        with open(config.output_file, "wb") as packed:
+            write_maze(packed, maze, directions)
+    else:
+        with open(config.output_file, "w") as output:
+            maze.write_hex(output, directions)
+
+
+if __name__ == "__main__":
+    main()
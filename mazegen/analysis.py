@@ -0,0 +1,97 @@
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .solvers import OPEN_COUNT
+from .walls import EAST, NORTH, SOUTH, WEST, closed_border
+
+if TYPE_CHECKING:
+    from .mazegen import MazeGenerator
+
+
+BACK = {NORTH: SOUTH, EAST: WEST, SOUTH: NORTH, WEST: EAST}
+
+
+@dataclass(slots=True)
+class MazeStats:
+    """Shape and difficulty metrics of a maze.
+
+    ``corridors[length]`` counts the passages of ``length`` moves
+    between two dead ends or junctions, through cells with exactly two
+    openings. ``loops`` is the number of openings beyond a spanning
+    tree, 0 for a perfect maze. ``tortuosity`` is the solution length
+    over the Manhattan distance from entry to exit and ``diameter`` the
+    longest shortest path found by a double BFS sweep, exact for perfect
+    mazes."""
+    dead_ends: int
+    junctions: int
+    loops: int
+    solution_length: int
+    tortuosity: float
+    diameter: int
+    corridors: list[int] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as plain JSON-ready values."""
+        return asdict(self)
+
+
+def corridor_lengths(cells: bytes | bytearray, degree: bytes | bytearray,
+                     width: int) -> list[int]:
+    """Return the histogram of corridor lengths between the cells whose
+    number of openings is not 2.
+
+    Every corridor is walked once from each end, following the one exit
+    of each two-way cell, so the work is linear in the cells."""
+    step = {NORTH: -width, EAST: 1, SOUTH: width, WEST: -1}
+    histogram = [0]
+    for index, count in enumerate(degree):
+        if count == 0 or count == 2:
+            continue
+        opens = cells[index] ^ 0b1111
+        for bit, offset in step.items():
+            if not opens & bit:
+                continue
+            here = index + offset
+            came = BACK[bit]
+            length = 1
+            while degree[here] == 2:
+                bit = cells[here] ^ 0b1111 ^ came
+                here += step[bit]
+                came = BACK[bit]
+                length += 1
+            if length >= len(histogram):
+                histogram.extend([0] * (length + 1 - len(histogram)))
+            histogram[length] += 1
+    return [count // 2 for count in histogram]
+
+
+def analyze(maze: "MazeGenerator") -> MazeStats:
+    """Measure a generated maze in one pass over its wall bits.
+
+    Dead ends and junctions are counted on the ``OPEN_COUNT`` translation
+    of the walls, corridors are walked once from each end, and the
+    solution and diameter come from the maze BFS distance field: the
+    field from the entry (shared with ``Generate_solution_bfs``) gives
+    the solution and the farthest cell, and one more sweep from that
+    cell gives the diameter."""
+    width = maze.width
+    cells = closed_border(maze.cells, width)
+    degree = cells.translate(OPEN_COUNT)
+    free = len(cells) - maze.mask.count(1)
+    loops = max(0, sum(degree) // 2 - free + 1)
+
+    distances = maze.distance_field()
+    exit_x, exit_y = maze.exit
+    solution = distances[exit_y * width + exit_x]
+    straight = abs(exit_x - maze.entry[0]) + abs(exit_y - maze.entry[1])
+    far, _ = maze.farthest_cell()
+    _, diameter = maze.farthest_cell(far)
+
+    return MazeStats(
+        dead_ends=degree.count(1),
+        junctions=degree.count(3) + degree.count(4),
+        loops=loops,
+        solution_length=solution,
+        tortuosity=solution / straight if solution > 0 else 0.0,
+        diameter=diameter,
+        corridors=corridor_lengths(cells, degree, width))
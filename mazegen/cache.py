@@ -0,0 +1,110 @@
+import hashlib
+import os
+import struct
+
+from .loader import path_from_directions
+from .mazegen import MazeGenerator
+from .packed import PackedMaze, write_maze
+
+
+class MazeCache:
+    """Content-addressed on-disk cache of generated mazes and their
+    solutions.
+
+    Entries are packed maze files named after a hash of everything that
+    determines the maze. Reading an entry refreshes its modification
+    time, and the least recently used entries are deleted once the
+    directory grows past ``max_bytes``. Only seeded mazes are cached."""
+
+    def __init__(self, directory: str, max_bytes: int = 64 << 20) -> None:
+        """Use (and create if needed) ``directory`` for the entries."""
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, maze: MazeGenerator, algo: str) -> str:
+        """Return the cache key of ``maze`` generated with ``algo``."""
+        fields = (2, maze.width, maze.height, maze.seed, algo, maze.perfect,
+                  maze.braid, maze.entry, maze.exit,
+                  hashlib.sha256(maze.mask).hexdigest())
+        return hashlib.sha256(repr(fields).encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".amz")
+
+    def load(self, maze: MazeGenerator,
+             algo: str) -> list[tuple[int, int]] | None:
+        """Fill ``maze`` from the cache and return its solution, or
+        return None on a miss."""
+        if maze.seed is None:
+            self.misses += 1
+            return None
+        filename = self._path(self.key(maze, algo))
+        try:
+            with PackedMaze(filename) as packed:
+                if (packed.width, packed.height) != (maze.width,
+                                                     maze.height):
+                    raise ValueError(f"{filename} has the wrong size")
+                cells = packed.cells()
+                directions = packed.moves()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, struct.error):
+            self.misses += 1
+            self._discard(filename)
+            return None
+        os.utime(filename)
+        maze.load_cells(cells)
+        maze.algo = algo
+        self.hits += 1
+        return path_from_directions(maze.entry, directions)
+
+    def _discard(self, filename: str) -> None:
+        """Delete a corrupt entry so the next store replaces it."""
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+
+    def store(self, maze: MazeGenerator, algo: str,
+              path: list[tuple[int, int]]) -> None:
+        """Save a generated maze and its solution, then evict the least
+        recently used entries beyond the size cap."""
+        if maze.seed is None:
+            return
+        filename = self._path(self.key(maze, algo))
+        temporary = f"{filename}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as output:
+            write_maze(output, maze, maze.Drawing_solution_path(path))
+        os.replace(temporary, filename)
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete the oldest entries until the cache fits its cap."""
+        entries = [entry for entry in os.scandir(self.directory)
+                   if entry.name.endswith(".amz")]
+        stats = [(entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                 for entry in entries]
+        total = sum(size for _, size, _ in stats)
+        for _, size, path in sorted(stats):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def generate(self, maze: MazeGenerator,
+                 algo: str = "dfs") -> list[tuple[int, int]]:
+        """Generate and solve ``maze`` with ``algo``, serving it from
+        the cache when an identical maze was built before."""
+        path = self.load(maze, algo)
+        if path is None:
+            maze.generate(algo)
+            path = maze.Generate_solution_bfs()
+            self.store(maze, algo, path)
+        return path
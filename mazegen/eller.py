@@ -0,0 +1,213 @@
+import random
+from typing import Callable, Iterator, TextIO
+
+from .pattern import blocked_rows, pattern_42
+from .walls import EAST, HEX_DIGITS, NORTH, SOUTH, WEST
+
+
+class _Row:
+    """Set labels and walls of the row Eller's algorithm is working on."""
+    __slots__ = ("sets", "members", "walls")
+
+    def __init__(self, width: int) -> None:
+        """Initialize an empty, fully walled row."""
+        self.sets = [-1] * width
+        self.members: dict[int, list[int]] = {}
+        self.walls = bytearray(b"\x0f") * width
+
+    def add(self, x: int, label: int) -> None:
+        """Put cell ``x`` into set ``label``."""
+        self.sets[x] = label
+        self.members.setdefault(label, []).append(x)
+
+    def merge(self, x: int) -> None:
+        """Open the wall between ``x`` and ``x + 1`` if they are in
+        different sets, relabelling the smaller set."""
+        keep, drop = self.sets[x], self.sets[x + 1]
+        if keep == drop:
+            return
+        if len(self.members[keep]) < len(self.members[drop]):
+            keep, drop = drop, keep
+        for cell in self.members[drop]:
+            self.sets[cell] = keep
+        self.members[keep].extend(self.members.pop(drop))
+        self.walls[x] &= 0b1111 ^ EAST
+        self.walls[x + 1] &= 0b1111 ^ WEST
+
+
+def _live_cells(
+        width: int,
+        height: int,
+        blocked: dict[int, set[int]]
+        ) -> dict[int, bytes]:
+    """Flag, for the rows around blocked cells, the cells from which the
+    last row can be reached by moving sideways within the row and then
+    down. Rows missing from the result are live everywhere."""
+    rows = set(blocked) | {y - 1 for y in blocked}
+    live: dict[int, bytes] = {}
+    for y in sorted((y for y in rows if 0 <= y < height), reverse=True):
+        closed = blocked.get(y, set())
+        closed_below = blocked.get(y + 1, set())
+        below = live.get(y + 1)
+        runs = []
+        x = 0
+        while x < width:
+            if x in closed:
+                x += 1
+                continue
+            start = x
+            while x < width and x not in closed:
+                x += 1
+            runs.append(range(start, x))
+        flags = bytearray(width)
+        if y == height - 1:
+            runs = [max(runs, key=len)] if runs else []
+        else:
+            runs = [run for run in runs if any(
+                x not in closed_below and (below is None or below[x])
+                for x in run)]
+        for run in runs:
+            flags[run.start:run.stop] = b"\x01" * len(run)
+        live[y] = bytes(flags)
+    return live
+
+
+def stream_eller(
+        width: int,
+        height: int,
+        rng: random.Random,
+        blocked: dict[int, set[int]] | None = None
+        ) -> Iterator[bytearray]:
+    """Generate a perfect maze row by row using Eller's algorithm.
+
+    Yields the wall byte of every cell of one row at a time. Only the set
+    labels of the current row are kept, so memory stays O(width) plus the
+    ``blocked`` mapping (row -> closed columns). Rows around blocked
+    cells are steered by a reachability look-ahead so that no set gets
+    trapped behind the pattern."""
+    blocked = blocked or {}
+    live = _live_cells(width, height, blocked)
+    carried: list[int] = []
+    above = bytearray(width)
+    next_label = 0
+
+    for y in range(height):
+        closed = blocked.get(y, set())
+        last = y == height - 1
+        live_here = live.get(y)
+        row = _Row(width)
+        for x in range(width):
+            if x in closed:
+                continue
+            if above[x]:
+                row.add(x, carried[x])
+                row.walls[x] &= 0b1111 ^ NORTH
+            else:
+                row.add(x, next_label)
+                next_label += 1
+
+        sets = row.sets
+        for x in range(width - 1):
+            if sets[x] < 0 or sets[x + 1] < 0:
+                continue
+            if last or (live_here is not None and not live_here[x]) \
+                    or rng.random() < 0.5:
+                row.merge(x)
+
+        below = bytearray(width)
+        if not last:
+            closed_below = blocked.get(y + 1, set())
+            live_below = live.get(y + 1)
+
+            def can_drop(x: int) -> bool:
+                return x not in closed_below and (
+                    live_below is None or bool(live_below[x]))
+
+            if closed_below or live_below is not None:
+                _reach_live_drop(row, width, live_here, can_drop)
+
+            for members in row.members.values():
+                options = [x for x in members if can_drop(x)]
+                if not options:
+                    continue
+                dropped = False
+                for x in options:
+                    if rng.random() < 0.5:
+                        below[x] = 1
+                        dropped = True
+                if not dropped:
+                    below[rng.choice(options)] = 1
+            if live_below is not None:
+                for x in range(width):
+                    if sets[x] >= 0 and x not in closed_below \
+                            and not live_below[x]:
+                        below[x] = 1
+            for x in range(width):
+                if below[x]:
+                    row.walls[x] &= 0b1111 ^ SOUTH
+
+        carried = sets
+        above = below
+        yield row.walls
+
+
+def _reach_live_drop(
+        row: _Row,
+        width: int,
+        live_here: bytes | None,
+        can_drop: Callable[[int], bool]
+        ) -> None:
+    """Merge every set that cannot continue downwards sideways towards
+    the nearest cell of its run that can."""
+    sets = row.sets
+    for label in list(row.members):
+        members = row.members.get(label)
+        if members is None or any(can_drop(x) for x in members):
+            continue
+        starts = [x for x in members if live_here is None or live_here[x]]
+        if not starts:
+            continue
+        start = starts[0]
+        targets = []
+        for step in (-1, 1):
+            x = start
+            while 0 <= x + step < width and sets[x + step] >= 0:
+                x += step
+                if can_drop(x):
+                    targets.append(x)
+                    break
+        if not targets:
+            continue
+        target = min(targets, key=lambda x: abs(x - start))
+        for x in range(min(start, target), max(start, target)):
+            row.merge(x)
+
+
+def stream_hex(
+        width: int,
+        height: int,
+        seed: int | None = None
+        ) -> Iterator[str]:
+    """Yield the rows of an Eller maze with the '42' pattern as lines of
+    the hexadecimal output format."""
+    rng = random.Random(seed)
+    blocked = blocked_rows(pattern_42(width, height))
+    for walls in stream_eller(width, height, rng, blocked):
+        yield walls.translate(HEX_DIGITS).decode("ascii")
+
+
+def write_stream(
+        output: TextIO,
+        width: int,
+        height: int,
+        entry: tuple[int, int],
+        exit: tuple[int, int],
+        seed: int | None = None
+        ) -> None:
+    """Stream a maze in the hexadecimal output format. The solution
+    line is left empty since solving needs the whole grid."""
+    for line in stream_hex(width, height, seed):
+        output.write(line + "\n")
+    output.write("\n")
+    output.write(f"{entry[0]},{entry[1]}\n")
+    output.write(f"{exit[0]},{exit[1]}\n")
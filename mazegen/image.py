@@ -0,0 +1,236 @@
+import argparse
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, BinaryIO, Iterator
+
+from .walls import EAST, NORTH, SOUTH, WEST
+
+if TYPE_CHECKING:
+    from .mazegen import MazeGenerator
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+IDAT_SIZE = 1 << 16
+
+# Per-cell codes of a scanline: bits 0-1 give the state of the wall
+# before the cell (0 closed, 1 open, 2 open along the path) and bits 2-4
+# what fills the cell (FLOOR, MASK, PATH, ENTRY, EXIT).
+OPEN, ON_PATH = 1, 2
+FLOOR, MASK, PATH, ENTRY, EXIT = (kind << 2 for kind in range(5))
+WEST_OPEN = bytes(0 if value & WEST else OPEN for value in range(256))
+NORTH_OPEN = bytes(0 if value & NORTH else OPEN for value in range(256))
+SOUTH_OPEN = bytes(0 if value & SOUTH else OPEN for value in range(256))
+MASKED = bytes.maketrans(b"\x01", bytes([MASK]))
+LINKS = {(0, -1): (NORTH, SOUTH), (1, 0): (EAST, WEST),
+         (0, 1): (SOUTH, NORTH), (-1, 0): (WEST, EAST)}
+
+Color = tuple[int, int, int]
+
+
+@dataclass(slots=True)
+class Palette:
+    """RGB colours of the exported image."""
+    wall: Color = (230, 230, 230)
+    floor: Color = (20, 24, 48)
+    mask: Color = (128, 128, 128)
+    path: Color = (40, 170, 70)
+    entry: Color = (110, 220, 60)
+    exit: Color = (230, 50, 40)
+
+
+def image_size(maze: "MazeGenerator", cell: int = 8,
+               wall: int = 2) -> tuple[int, int]:
+    """Return the pixel width and height of the exported ``maze``."""
+    return (maze.width * (cell + wall) + wall,
+            maze.height * (cell + wall) + wall)
+
+
+def _path_links(
+        path: list[tuple[int, int]]
+        ) -> dict[int, dict[int, int]]:
+    """Map each maze row to its path cells and the wall bits the path
+    crosses out of them."""
+    rows: dict[int, dict[int, int]] = {}
+    for x, y in path:
+        rows.setdefault(y, {}).setdefault(x, 0)
+    for (x, y), (next_x, next_y) in zip(path, path[1:]):
+        bits = LINKS.get((next_x - x, next_y - y))
+        if bits is not None:
+            rows[y][x] |= bits[0]
+            rows[next_y][next_x] |= bits[1]
+    return rows
+
+
+def scanlines(
+        maze: "MazeGenerator",
+        path: list[tuple[int, int]] | None = None,
+        cell: int = 8,
+        wall: int = 2,
+        palette: Palette | None = None
+        ) -> Iterator[tuple[bytes, int]]:
+    """Yield the RGB scanlines of ``maze`` as (pixels, repeat) pairs,
+    top to bottom.
+
+    Every maze row gives one wall band (its north walls) and one cell
+    band. A band is the same scanline repeated, so only two scanlines
+    are built per maze row. Each is a join of precomputed pixel
+    segments picked by a per-cell code that ``translate`` derives from
+    the wall and mask rows. Only the path cells and the entry and exit
+    are patched one by one. Memory is therefore bounded by the image
+    width, whatever the height."""
+    colors = palette or Palette()
+    wall_rgb = bytes(colors.wall)
+    fills = [bytes(color) for color in (colors.floor, colors.mask,
+                                        colors.path, colors.entry,
+                                        colors.exit)]
+    edges = (wall_rgb, bytes(colors.floor), bytes(colors.path))
+    cell_segments = [b""] * 32
+    for kind, fill in enumerate(fills):
+        for state, edge in enumerate(edges):
+            cell_segments[kind << 2 | state] = edge * wall + fill * cell
+    top_segments = [wall_rgb * wall + edge * cell for edge in edges]
+    corner = wall_rgb * wall
+
+    width = maze.width
+    cells = maze.cells
+    mask = maze.mask
+    links = _path_links(path or [])
+    marks = {maze.entry: ENTRY, maze.exit: EXIT}
+    for y in range(maze.height):
+        row = cells[y * width:(y + 1) * width]
+        on_path = links.get(y, {})
+        top = bytearray(row.translate(NORTH_OPEN))
+        codes = bytearray(
+            (int.from_bytes(row.translate(WEST_OPEN), "little")
+             | int.from_bytes(mask[y * width:(y + 1) * width]
+                              .translate(MASKED), "little"))
+            .to_bytes(width, "little"))
+        for x, bits in on_path.items():
+            codes[x] = PATH | (ON_PATH if bits & WEST else codes[x] & 3)
+            if bits & NORTH:
+                top[x] = ON_PATH
+        for (x, mark_y), mark in marks.items():
+            if mark_y == y:
+                codes[x] = mark | codes[x] & 3
+        if wall:
+            yield (b"".join(map(top_segments.__getitem__, top)) + corner,
+                   wall)
+        if cell:
+            yield (b"".join(map(cell_segments.__getitem__, codes))
+                   + corner, cell)
+    if wall:
+        last = cells[(maze.height - 1) * width:]
+        yield (b"".join(map(top_segments.__getitem__,
+                            last.translate(SOUTH_OPEN))) + corner, wall)
+
+
+def write_ppm(
+        output: BinaryIO,
+        maze: "MazeGenerator",
+        path: list[tuple[int, int]] | None = None,
+        cell: int = 8,
+        wall: int = 2,
+        palette: Palette | None = None
+        ) -> int:
+    """Write ``maze`` as a binary PPM (P6) image, one scanline at a
+    time. Returns the number of bytes written."""
+    with maze.phase("write"):
+        pixels_wide, pixels_high = image_size(maze, cell, wall)
+        written = output.write(
+            f"P6\n{pixels_wide} {pixels_high}\n255\n".encode("ascii"))
+        for line, repeat in scanlines(maze, path, cell, wall, palette):
+            for _ in range(repeat):
+                written += output.write(line)
+    if maze.profile is not None:
+        maze.profile.bytes_written += written
+    return written
+
+
+def _chunk(output: BinaryIO, kind: bytes, data: bytes) -> int:
+    """Write one PNG chunk and return its size."""
+    return output.write(struct.pack(">I", len(data)) + kind + data
+                        + struct.pack(">I", zlib.crc32(data,
+                                                       zlib.crc32(kind))))
+
+
+def write_png(
+        output: BinaryIO,
+        maze: "MazeGenerator",
+        path: list[tuple[int, int]] | None = None,
+        cell: int = 8,
+        wall: int = 2,
+        palette: Palette | None = None,
+        level: int = 6
+        ) -> int:
+    """Write ``maze`` as an 8-bit RGB PNG image. Returns the number of
+    bytes written.
+
+    Scanlines are fed to one zlib stream as they are built. The repeats
+    of a band use the "up" filter, so they are runs of zero bytes that
+    compress almost for free. The compressed data goes out in IDAT
+    chunks of about 64 KiB, so neither the pixels nor the compressed
+    image are ever held whole."""
+    with maze.phase("write"):
+        pixels_wide, pixels_high = image_size(maze, cell, wall)
+        written = output.write(PNG_SIGNATURE)
+        written += _chunk(output, b"IHDR", struct.pack(
+            ">IIBBBBB", pixels_wide, pixels_high, 8, 2, 0, 0, 0))
+        compressor = zlib.compressobj(level)
+        same = b"\x02" + bytes(3 * pixels_wide)
+        pending = bytearray()
+        for line, repeat in scanlines(maze, path, cell, wall, palette):
+            pending += compressor.compress(b"\x00" + line)
+            for _ in range(repeat - 1):
+                pending += compressor.compress(same)
+            if len(pending) >= IDAT_SIZE:
+                written += _chunk(output, b"IDAT", bytes(pending))
+                pending.clear()
+        pending += compressor.flush()
+        written += _chunk(output, b"IDAT", bytes(pending))
+        written += _chunk(output, b"IEND", b"")
+    if maze.profile is not None:
+        maze.profile.bytes_written += written
+    return written
+
+
+def export_image(
+        filename: str,
+        maze: "MazeGenerator",
+        path: list[tuple[int, int]] | None = None,
+        cell: int = 8,
+        wall: int = 2,
+        palette: Palette | None = None
+        ) -> int:
+    """Write ``maze`` to ``filename``, as PPM if the name ends in .ppm
+    and as PNG otherwise."""
+    with open(filename, "wb") as output:
+        if filename.lower().endswith(".ppm"):
+            return write_ppm(output, maze, path, cell, wall, palette)
+        return write_png(output, maze, path, cell, wall, palette)
+
+
+def main() -> None:
+    """Render a maze file in the hexadecimal format as an image."""
+    from .loader import load_hex
+
+    parser = argparse.ArgumentParser(
+        description="Export a maze file as a PNG or PPM image.")
+    parser.add_argument("source", help="maze file in the output format")
+    parser.add_argument("target", help="image file, .png or .ppm")
+    parser.add_argument("--cell", type=int, default=8,
+                        help="side of a cell, in pixels")
+    parser.add_argument("--wall", type=int, default=2,
+                        help="thickness of a wall, in pixels")
+    parser.add_argument("--no-path", action="store_true",
+                        help="leave the solution out")
+    args = parser.parse_args()
+    if args.cell < 1 or args.wall < 0:
+        parser.error("--cell must be at least 1 and --wall at least 0")
+    maze, path = load_hex(args.source)
+    export_image(args.target, maze, None if args.no_path else path,
+                 args.cell, args.wall)
+
+
+if __name__ == "__main__":
+    main()
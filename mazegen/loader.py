@@ -0,0 +1,159 @@
+from dataclasses import dataclass
+
+from .mazegen import MazeGenerator
+from .solvers import OPEN_COUNT
+from .walls import EAST, NORTH, SOUTH, WALL_BITS, WEST
+
+
+HEX_VALUES = bytes(int(chr(value), 16)
+                   if chr(value) in "0123456789ABCDEFabcdef" else 0xFF
+                   for value in range(256))
+STEPS = {"N": (0, -1), "E": (1, 0), "S": (0, 1), "W": (-1, 0)}
+
+
+def _bit_table(bit: int) -> bytes:
+    """Return a translate table mapping a wall byte to 1 if ``bit`` is
+    closed, else 0."""
+    return bytes(1 if value & bit else 0 for value in range(256))
+
+
+CLOSED = bytes(1 if value == 0b1111 else 0 for value in range(256))
+NORTH_BIT = _bit_table(NORTH)
+EAST_BIT = _bit_table(EAST)
+SOUTH_BIT = _bit_table(SOUTH)
+WEST_BIT = _bit_table(WEST)
+
+
+@dataclass(slots=True)
+class HexMaze:
+    """Raw content of a maze file in the hexadecimal output format."""
+    width: int
+    height: int
+    cells: bytearray
+    entry: tuple[int, int]
+    exit: tuple[int, int]
+    directions: str
+
+
+def _point(line: bytes) -> tuple[int, int]:
+    """Parse an ``x,y`` line."""
+    x, y = line.split(b",")
+    return int(x), int(y)
+
+
+def parse_hex(data: bytes | str) -> HexMaze:
+    """Decode a maze file in the hexadecimal output format.
+
+    The grid digits are turned into wall values with one
+    ``bytes.translate`` call over the whole grid."""
+    if isinstance(data, str):
+        data = data.encode("ascii")
+    lines = data.split(b"\n")
+    try:
+        blank = lines.index(b"")
+    except ValueError:
+        raise ValueError("missing empty line after the maze grid")
+    rows = lines[:blank]
+    if not rows or any(len(row) != len(rows[0]) for row in rows):
+        raise ValueError("maze rows must be non-empty and of equal width")
+    if len(lines) < blank + 3:
+        raise ValueError("missing entry or exit line")
+    cells = bytearray(b"".join(rows).translate(HEX_VALUES))
+    if max(cells) > 0b1111:
+        raise ValueError("maze grid contains a non hexadecimal digit")
+    directions = lines[blank + 3].decode("ascii").strip() \
+        if len(lines) > blank + 3 else ""
+    width, height = len(rows[0]), len(rows)
+    entry = _point(lines[blank + 1])
+    exit = _point(lines[blank + 2])
+    for name, (x, y) in (("entry", entry), ("exit", exit)):
+        if not (0 <= x < width and 0 <= y < height):
+            raise ValueError(f"the {name} point {x},{y} is outside the "
+                             f"maze")
+    return HexMaze(width, height, cells, entry, exit, directions)
+
+
+def validate_walls(cells: bytes | bytearray, width: int,
+                   height: int) -> None:
+    """Check that the outer walls are closed and that every wall is
+    seen the same way from both of its cells.
+
+    Each direction is extracted into a 0/1 buffer with ``translate`` and
+    neighbours are compared with shifted slices, so the checks run at C
+    speed. Raises ValueError naming the first inconsistent cell."""
+    north = cells.translate(NORTH_BIT)
+    east = cells.translate(EAST_BIT)
+    south = cells.translate(SOUTH_BIT)
+    west = cells.translate(WEST_BIT)
+    if 0 in north[:width] or 0 in south[-width:] \
+            or 0 in west[0::width] or 0 in east[width - 1::width]:
+        raise ValueError("the outer walls of the maze must be closed")
+    for first, second, step in ((east, west, 1), (south, north, width)):
+        if first[:-step] != second[step:]:
+            index = next(index for index in range(len(cells) - step)
+                         if first[index] != second[index + step])
+            raise ValueError(f"inconsistent wall between cell "
+                             f"{index % width},{index // width} and "
+                             f"{(index + step) % width},"
+                             f"{(index + step) // width}")
+
+
+def path_from_directions(
+        entry: tuple[int, int],
+        directions: str
+        ) -> list[tuple[int, int]]:
+    """Rebuild the list of cells visited by a N/E/S/W move string."""
+    x, y = entry
+    path = [(x, y)]
+    for move in directions:
+        if move not in STEPS:
+            raise ValueError(f"unknown move {move!r} in the solution")
+        dx, dy = STEPS[move]
+        x, y = x + dx, y + dy
+        path.append((x, y))
+    return path
+
+
+def validate_path(cells: bytes | bytearray, width: int, height: int,
+                  path: list[tuple[int, int]],
+                  directions: str) -> None:
+    """Check that every move of a solution leaves its cell through an
+    open wall and stays inside the grid. ``path`` is the result of
+    ``path_from_directions`` for ``directions``. Raises ValueError
+    naming the first bad move."""
+    for number, ((x, y), move) in enumerate(zip(path, directions), 1):
+        next_x, next_y = path[number]
+        if not (0 <= next_x < width and 0 <= next_y < height):
+            raise ValueError(f"solution move {number} ({move}) leaves the "
+                             f"maze at {x},{y}")
+        if cells[y * width + x] & WALL_BITS[move]:
+            raise ValueError(f"solution move {number} ({move}) crosses a "
+                             f"wall at {x},{y}")
+
+
+def load_hex(
+        source: str | bytes,
+        validate: bool = True
+        ) -> tuple[MazeGenerator, list[tuple[int, int]]]:
+    """Load a maze file (a path or its raw bytes) back into a
+    MazeGenerator, returning it with the stored solution path.
+
+    With ``validate`` the walls are checked by ``validate_walls`` and
+    the solution by ``validate_path``; a solution letter other than
+    N, E, S or W is refused either way."""
+    if isinstance(source, str):
+        with open(source, "rb") as text:
+            source = text.read()
+    parsed = parse_hex(source)
+    path = path_from_directions(parsed.entry, parsed.directions)
+    if validate:
+        validate_walls(parsed.cells, parsed.width, parsed.height)
+        validate_path(parsed.cells, parsed.width, parsed.height, path,
+                      parsed.directions)
+    cells = parsed.cells
+    openings = sum(cells.translate(OPEN_COUNT)) // 2
+    perfect = openings == len(cells) - cells.count(0b1111) - 1
+    maze = MazeGenerator(parsed.width, parsed.height, parsed.entry,
+                         parsed.exit, perfect, mask=cells.translate(CLOSED))
+    maze.load_cells(cells)
+    return maze, path
@@ -1,6 +1,25 @@
 import random
-from collections import deque
+from array import array
+import sys
 import time
+from contextlib import AbstractContextManager, nullcontext
+from typing import Iterable, Iterator, TextIO
+
+from .analysis import MazeStats, analyze
+from .eller import stream_eller
+from .pattern import (blocked_rows, free_regions, mask_cells, pattern_42,
+                      pattern_mask)
+from .profiling import Profile
+from .solvers import SolveStats, solve
+from .steps import StepLog
+from .vectorized import VECTORIZED_ALGOS, carve_vectorized
+from .walls import (EAST, HEX_DIGITS, NORTH, OPPOSITE, SOUTH, WALL_BITS,
+                    WEST, closed_border)
+from .wilson import carve_wilson
+
+
+RESET = "\033[0m"
+ALGORITHMS = ("dfs", "prim", "eller", "wilson") + VECTORIZED_ALGOS
 
 
 class MazeGenerator:
@@ -14,9 +33,23 @@ class MazeGenerator:
         exit: tuple[int, int],
         perfect: bool,
         seed: int | None = None,
-        anim: bool = False
+        anim: bool = False,
+        braid: float = 0.1,
+        profile: Profile | None = None,
+        mask: bytes | bytearray | None = None
     ) -> None:
-        """Initialize a MazeGenerator instance."""
+        """Initialize a MazeGenerator instance.
+
+        Walls are stored one byte per cell in ``cells`` and the visited
+        flags in ``visited``, both indexed by ``y * width + x``.
+        ``grid[y][x]`` is a thin view over these buffers. ``braid`` is
+        the share of inner walls knocked out when ``perfect`` is
+        False. Passing a ``profile`` turns on the timing and counters of
+        ``mazegen.profiling``; several mazes may share one.
+
+        ``mask`` flags the blocked cells (1) of the maze, indexed like
+        ``cells``, and defaults to the '42' pattern. It is kept as
+        ``self.mask`` so every blocked-cell test is a single lookup."""
 
         self.width = width
         self.height = height
@@ -25,34 +58,59 @@ class MazeGenerator:
         self.perfect = perfect
         self.seed = seed
         self.anim = anim
-        self.generation_steps: list[tuple[int, int, str]] = []
+        self.braid = braid
+        self.algo = ""
+        self.generation_steps = StepLog(width, height)
+        self._replay_pending = False
 
         self.rng = random.Random(seed)
 
-        self.grid = []
-        for _ in range(height):
-            rows = []
-            for _ in range(width):
-                rows.append(Cell())
-            self.grid.append(rows)
+        self.cells = bytearray(b"\x0f") * (width * height)
+        self.visited = bytearray(width * height)
+        self.grid = Grid(self)
+
+        self.distances = array("i")
+        self.parents = array("i")
+        self._unreached = array("i")
+        self._closed = b""
+        self._field_origin: int | None = None
+        self.field_expanded = 0
+        self.solve_stats: SolveStats | None = None
+        self.profile = profile
+        self._regions: tuple[array, list[int]] | None = None
+        if mask is None:
+            mask = pattern_mask(width, height, pattern_42(width, height))
+            self._regions = (array("i"), [width * height - mask.count(1)])
+        self.mask = bytearray(mask)
+        self._pattern: list[tuple[int, int]] | None = None
+
+    def phase(self, name: str) -> AbstractContextManager[None]:
+        """Time a ``with`` block as phase ``name`` of the profile, or do
+        nothing when profiling is off."""
+        if self.profile is None:
+            return nullcontext()
+        return self.profile.phase(name)
 
     def Draw_42(self) -> list[tuple[int, int]] | None:
-        """Draws the '42' wall pattern inside the maze."""
-        if self.height >= 10 and self.width >= 10:
-            width = int((self.width - 7) / 2)
-            height = int((self.height - 5) / 2)
-            walls_42 = [(height, width), (height+1, width),
-                        (height+2, width), (height+2, width+1),
-                        (height+2, width+2), (height+1, width+2),
-                        (height, width+2), (height+3, width+2),
-                        (height+4, width+2), (height+4, width+4),
-                        (height+4, width+5), (height+4, width+6),
-                        (height+3, width+4), (height+2, width+4),
-                        (height+2, width+5), (height+2, width+6),
-                        (height+1, width+6), (height, width+6),
-                        (height, width+5), (height, width+4),]
-            return walls_42
-        return None
+        """Return the (row, column) cells of the blocked pattern, the
+        '42' by default, or None if the maze has none."""
+        if self._pattern is None:
+            self._pattern = mask_cells(self.mask, self.width)
+        return self._pattern or None
+
+    def regions(self) -> tuple[array, list[int]]:
+        """Return the free-region label of every cell and the size of
+        each region (see ``pattern.free_regions``), computed once.
+
+        The '42' never splits the grid, so for the default mask the
+        labels are left empty and the one region is all free cells."""
+        if self._regions is None:
+            self._regions = free_regions(self.mask, self.width)
+        return self._regions
+
+    def is_blocked(self, x: int, y: int) -> bool:
+        """Tell whether cell (x, y) belongs to the blocked pattern."""
+        return bool(self.mask[y * self.width + x])
 
     def check_available_wall(self, x: int, y: int) -> bool:
         """Check whether a cell coordinate is inside the maze boundaries."""
@@ -62,16 +120,9 @@ class MazeGenerator:
 
     def remove_wall(self, x: int, y: int, direction: str) -> None:
         """Remove a wall from a cell in a given direction."""
-        cell = self.grid[y][x]
-
-        if direction == "N":
-            cell.walls &= 0b1110
-        elif direction == "E":
-            cell.walls &= 0b1101
-        elif direction == "S":
-            cell.walls &= 0b1011
-        elif direction == "W":
-            cell.walls &= 0b0111
+        self._field_origin = None
+        if direction in WALL_BITS:
+            self.cells[y * self.width + x] &= 0b1111 ^ WALL_BITS[direction]
 
     def remove_opposite_wall(self, x: int, y: int, direction: str) -> None:
         """Remove the wall between a cell and its neighboring cell
@@ -93,50 +144,107 @@ class MazeGenerator:
             -> list[tuple[int, int, str]]:
         """Get all unvisited neighboring cells reachable from the
         current cell."""
-        directions = ["N", "E", "S", "W"]
+        width = self.width
         unvisited_walls = []
-        for dir in directions:
-            if dir == "N" and self.check_available_wall(x, y-1) \
-                    and not self.grid[y-1][x].is_visited:
-                unvisited_walls.append((x, y-1, "N"))
-            elif dir == "E" and self.check_available_wall(x+1, y) \
-                    and not self.grid[y][x+1].is_visited:
-                unvisited_walls.append((x+1, y, "E"))
-            elif dir == "S" and self.check_available_wall(x, y+1) \
-                    and not self.grid[y+1][x].is_visited:
-                unvisited_walls.append((x, y+1, "S"))
-            elif dir == "W" and self.check_available_wall(x-1, y) \
-                    and not self.grid[y][x-1].is_visited:
-                unvisited_walls.append((x-1, y, "W"))
+        for index, direction in self._unvisited_neighbours(y * width + x):
+            unvisited_walls.append((index % width, index // width, direction))
         return unvisited_walls
 
+    def _unvisited_neighbours(self, index: int) -> list[tuple[int, str]]:
+        """Get the flat indices of the unvisited neighbours of a cell,
+        in N, E, S, W order."""
+        width = self.width
+        visited = self.visited
+        y, x = divmod(index, width)
+        neighbours = []
+        if y > 0 and not visited[index - width]:
+            neighbours.append((index - width, "N"))
+        if x < width - 1 and not visited[index + 1]:
+            neighbours.append((index + 1, "E"))
+        if y < self.height - 1 and not visited[index + width]:
+            neighbours.append((index + width, "S"))
+        if x > 0 and not visited[index - 1]:
+            neighbours.append((index - 1, "W"))
+        return neighbours
+
     def remove_visited_walls(self) -> None:
         """ Reset the visited state of all cells in the maze."""
-        for y in range(self.height):
-            for x in range(self.width):
-                self.grid[y][x].is_visited = False
+        self.visited[:] = bytes(len(self.visited))
 
     def generate(self, algo: str = 'dfs') -> None:
-        """Generate the maze using the specified algorithm."""
-        walls = self.Draw_42()
-
-        if walls is not None:
-            for y, x in walls:
-                self.grid[y][x].is_visited = True
-        if algo == "dfs":
-            self.grid[0][0].is_visited = True
-            self.dfs(0, 0, self.anim)
-        elif algo == "prim":
-            self.grid[0][0].is_visited = True
-            self.prim(0, 0, self.anim)
-        if not self.perfect and walls is not None:
-            self.remove_visited_walls()
-            for y, x in walls:
-                self.grid[y][x].is_visited = True
+        """Generate the maze using the specified algorithm.
+
+        ``algo`` is one of "dfs", "prim", "eller", "wilson" (uniformly
+        random) or, when numpy is installed, "binary_tree" and
+        "sidewinder". Any other name raises ValueError. Carving starts
+        from a closed grid and an empty step log, so calling it again
+        replaces the maze instead of laying a second tree over it."""
+        if algo not in ALGORITHMS:
+            raise ValueError(f"unknown algorithm: {algo}")
+        self._field_origin = None
+        self.algo = algo
+        width = self.width
+        start = max(self.mask.find(0), 0)
+
+        with self.phase("generate"):
+            self._close_walls()
+            self.visited[:] = self.mask
+            self.generation_steps.clear()
             if algo == "dfs":
-                self.dfs(0, 0, self.anim)
+                self.visited[start] = 1
+                self.dfs(start % width, start // width, self.anim)
             elif algo == "prim":
-                self.prim(0, 0, self.anim)
+                self.visited[start] = 1
+                self.prim(start % width, start // width, self.anim)
+            elif algo == "eller":
+                self.eller(self.anim)
+            elif algo == "wilson":
+                carve_wilson(self, self.anim)
+            elif algo in VECTORIZED_ALGOS:
+                carve_vectorized(self, algo)
+            if not self.perfect:
+                with self.phase("loops"):
+                    self.add_loops(self.braid, self.anim)
+        self._replay_pending = self.anim
+        if self.profile is not None:
+            self.profile.cells_carved += len(self.cells) - self.mask.count(1)
+
+    def add_loops(self, braid: float, animate: bool = True) -> None:
+        """Turn the carved spanning tree into an imperfect maze by
+        removing ``braid`` (0 to 1) of its remaining inner walls.
+
+        Candidate walls are indexed in one pass over the wall buffer and
+        the knocked out ones are drawn with ``self.rng``, so the cost is
+        O(cells) and the number of loops is controlled."""
+        cells = self.cells
+        width = self.width
+        last_row = len(cells) - width
+        blocked = self.mask
+
+        candidates = []
+        for index in range(len(cells)):
+            if blocked[index]:
+                continue
+            walls = cells[index]
+            if walls & EAST and index % width < width - 1 \
+                    and not blocked[index + 1]:
+                candidates.append(2 * index)
+            if walls & SOUTH and index < last_row \
+                    and not blocked[index + width]:
+                candidates.append(2 * index + 1)
+
+        count = round(min(max(braid, 0.0), 1.0) * len(candidates))
+        for candidate in self.rng.sample(candidates, count):
+            index, south = divmod(candidate, 2)
+            if south:
+                cells[index] &= 0b1111 ^ SOUTH
+                cells[index + width] &= 0b1111 ^ NORTH
+            else:
+                cells[index] &= 0b1111 ^ EAST
+                cells[index + 1] &= 0b1111 ^ WEST
+            if animate:
+                self.generation_steps.append(
+                    (index % width, index // width, "S" if south else "E"))
 
     def dfs(
             self,
@@ -144,22 +252,52 @@ class MazeGenerator:
             y: int,
             animate: bool = True
             ) -> None:
-        """Generate the maze using the Depth-First Search (DFS) algorithm."""
-
-        while True:
-            available_walls = self.get_available_unvisited_walls(x, y)
+        """Generate the maze using the Depth-First Search (DFS) algorithm.
+
+        The backtracking is driven by an explicit stack instead of
+        recursion, so the maze size is not bounded by the interpreter
+        recursion limit."""
+
+        cells = self.cells
+        visited = self.visited
+        width = self.width
+        last_row = (self.height - 1) * width
+        rng = self.rng
+        stack = [y * width + x]
+        track = self.profile is not None
+        peak = 0
+
+        while stack:
+            index = stack[-1]
+            x = index % width
+            available_walls = []
+            if index >= width and not visited[index - width]:
+                available_walls.append((index - width, "N"))
+            if x < width - 1 and not visited[index + 1]:
+                available_walls.append((index + 1, "E"))
+            if index < last_row and not visited[index + width]:
+                available_walls.append((index + width, "S"))
+            if x > 0 and not visited[index - 1]:
+                available_walls.append((index - 1, "W"))
             if not available_walls:
-                return
-            choice = self.rng.choice(available_walls)
-            nx, ny, direction = choice
+                if track and len(stack) > peak:
+                    peak = len(stack)
+                stack.pop()
+                continue
+            neighbour, direction = rng.choice(available_walls)
 
-            self.grid[ny][nx].is_visited = True
-            self.remove_opposite_wall(x, y, direction)
+            visited[neighbour] = 1
+            cells[index] &= 0b1111 ^ WALL_BITS[direction]
+            cells[neighbour] &= 0b1111 ^ WALL_BITS[OPPOSITE[direction]]
 
             if animate:
-                self.generation_steps.append((x, y, direction))
+                self.generation_steps.append((x, index // width, direction))
+
+            stack.append(neighbour)
 
-            self.dfs(nx, ny, animate)
+        if self.profile is not None:
+            self.profile.frontier_peak = max(self.profile.frontier_peak,
+                                             peak)
 
     def prim(
             self,
@@ -167,101 +305,197 @@ class MazeGenerator:
             s_y: int,
             animate: bool = True,
             ) -> None:
-        """Generate the maze using Prim's algorithm."""
+        """Generate the maze using Prim's algorithm.
 
-        walls = []
+        The frontier is popped by swapping the chosen entry with the last
+        one, so each step is O(1), and every draw goes through the seeded
+        ``self.rng``."""
 
-        self.grid[s_y][s_x].is_visited = True
+        cells = self.cells
+        visited = self.visited
+        width = self.width
+        rng = self.rng
+        offsets = {"N": -width, "E": 1, "S": width, "W": -1}
+        start = s_y * width + s_x
 
-        walls.extend(self.get_available_unvisited_walls(s_x, s_y))
+        visited[start] = 1
 
-        while walls:
-            nx, ny, direction = random.choice(walls)
-            walls.remove((nx, ny, direction))
+        walls = self._unvisited_neighbours(start)
+        track = self.profile is not None
+        peak = 0
 
-            if self.grid[ny][nx].is_visited:
+        while walls:
+            if track and len(walls) > peak:
+                peak = len(walls)
+            pick = rng.randrange(len(walls))
+            index, direction = walls[pick]
+            walls[pick] = walls[-1]
+            walls.pop()
+
+            if visited[index]:
                 continue
 
-            if direction == "N":
-                self.remove_opposite_wall(nx, ny, "S")
-                if animate:
-                    self.generation_steps.append((nx, ny, "S"))
-            elif direction == "E":
-                self.remove_opposite_wall(nx, ny, "W")
-                if animate:
-                    self.generation_steps.append((nx, ny, "W"))
-            elif direction == "S":
-                self.remove_opposite_wall(nx, ny, "N")
-                if animate:
-                    self.generation_steps.append((nx, ny, "N"))
-            elif direction == "W":
-                self.remove_opposite_wall(nx, ny, "E")
-                if animate:
-                    self.generation_steps.append((nx, ny, "E"))
-
-            self.grid[ny][nx].is_visited = True
-
-            walls.extend(self.get_available_unvisited_walls(nx, ny))
+            back = OPPOSITE[direction]
+            cells[index] &= 0b1111 ^ WALL_BITS[back]
+            cells[index - offsets[direction]] &= 0b1111 ^ WALL_BITS[direction]
+            if animate:
+                self.generation_steps.append(
+                    (index % width, index // width, back))
+
+            visited[index] = 1
+
+            walls.extend(self._unvisited_neighbours(index))
+
+        if self.profile is not None:
+            self.profile.frontier_peak = max(self.profile.frontier_peak,
+                                             peak)
+
+    def eller(self, animate: bool = True) -> None:
+        """Generate the maze row by row using Eller's algorithm."""
+        width = self.width
+        blocked = blocked_rows(self.Draw_42())
+        rows = stream_eller(width, self.height, self.rng, blocked)
+        for y, walls in enumerate(rows):
+            self.cells[y * width:(y + 1) * width] = walls
+            if animate:
+                for x, cell in enumerate(walls):
+                    if not cell & EAST:
+                        self.generation_steps.append((x, y, "E"))
+                    if not cell & SOUTH:
+                        self.generation_steps.append((x, y, "S"))
+        self.visited[:] = b"\x01" * len(self.visited)
 
     def Generate_solution_bfs(self) -> list[tuple[int, int]]:
         """Generate a solution path from entry to exit using
         the Breadth-First Search (BFS) algorithm."""
-        start = self.entry
-        end = self.exit
-
-        queue = deque([start])
-        visited = set([start])
-        parent: dict[tuple[int, int], tuple[int, int] | None] = {start: None}
-
-        while queue:
-            x, y = queue.popleft()
-
-            if (x, y) == end:
-                break
-
-            cell = self.grid[y][x]
-
-            # NORTH
-            if cell.walls & 0b0001 == 0 and y > 0:
-                nx, ny = x, y - 1
-                if (nx, ny) not in visited:
-                    visited.add((nx, ny))
-                    parent[(nx, ny)] = (x, y)
-                    queue.append((nx, ny))
-
-            # EAST
-            if cell.walls & 0b0010 == 0 and x < self.width - 1:
-                nx, ny = x + 1, y
-                if (nx, ny) not in visited:
-                    visited.add((nx, ny))
-                    parent[(nx, ny)] = (x, y)
-                    queue.append((nx, ny))
-
-            # SOUTH
-            if cell.walls & 0b0100 == 0 and y < self.height - 1:
-                nx, ny = x, y + 1
-                if (nx, ny) not in visited:
-                    visited.add((nx, ny))
-                    parent[(nx, ny)] = (x, y)
-                    queue.append((nx, ny))
-
-            # WEST
-            if cell.walls & 0b1000 == 0 and x > 0:
-                nx, ny = x - 1, y
-                if (nx, ny) not in visited:
-                    visited.add((nx, ny))
-                    parent[(nx, ny)] = (x, y)
-                    queue.append((nx, ny))
+        with self.phase("solve"):
+            path = self.path_to(self.exit)
+        if self.profile is not None:
+            self.profile.nodes_expanded += self.field_expanded
+        return path
 
-        path = []
-        current: tuple[int, int] | None = end
-        while current is not None:
-            path.append(current)
-            current = parent[current]
+    def solve(self, method: str = "bfs") -> list[tuple[int, int]]:
+        """Solve the maze from entry to exit with the chosen solver:
+        "bfs", "astar", "bidirectional" or "dead_end".
+
+        Every solver returns the same path format; the nodes expanded
+        and the wall-clock time of the run are kept in
+        ``solve_stats``."""
+        with self.phase("solve"):
+            path, self.solve_stats = solve(self, method)
+        if self.profile is not None:
+            self.profile.nodes_expanded += self.solve_stats.nodes_expanded
+        return path
 
+    def analyze(self) -> MazeStats:
+        """Return the dead ends, junctions, loops, corridor lengths,
+        solution length, tortuosity and diameter of the maze."""
+        return analyze(self)
+
+    def distance_field(
+            self,
+            origin: tuple[int, int] | None = None
+            ) -> array:
+        """Return the BFS distance of every cell from ``origin`` (the
+        entry by default), -1 for unreachable cells.
+
+        Cells are flat indices and the distance and parent buffers are
+        ``array('i')``, refilled in place from one run to the next. The
+        field is cached until the walls change, so paths to any target
+        from the same origin are only a walk back through ``parents``.
+        ``field_expanded`` is the number of cells the call expanded: all
+        reached cells after a search, 0 when the cached field is reused.
+        Moves skip bounds checks and run on ``closed_border`` of the
+        walls instead, so an opened outer wall never leads off the
+        grid."""
+        x, y = origin if origin is not None else self.entry
+        start = y * self.width + x
+        if self._field_origin == start:
+            self.field_expanded = 0
+            return self.distances
+
+        width = self.width
+        cells = closed_border(self.cells, width)
+        if len(self._unreached) != len(cells):
+            self._unreached = array("i", [-1]) * len(cells)
+            self.parents = array("i", [-1]) * len(cells)
+            self.distances = array("i", self._unreached)
+        else:
+            self.distances[:] = self._unreached
+        distances = self.distances
+        parents = self.parents
+        distances[start] = 0
+        parents[start] = -1
+        frontier = [start]
+        expanded = 0
+        depth = 0
+        while frontier:
+            expanded += len(frontier)
+            depth += 1
+            reached = []
+            for index in frontier:
+                walls = cells[index]
+                if not walls & 0b0001:
+                    neighbour = index - width
+                    if distances[neighbour] < 0:
+                        distances[neighbour] = depth
+                        parents[neighbour] = index
+                        reached.append(neighbour)
+                if not walls & 0b0010:
+                    neighbour = index + 1
+                    if distances[neighbour] < 0:
+                        distances[neighbour] = depth
+                        parents[neighbour] = index
+                        reached.append(neighbour)
+                if not walls & 0b0100:
+                    neighbour = index + width
+                    if distances[neighbour] < 0:
+                        distances[neighbour] = depth
+                        parents[neighbour] = index
+                        reached.append(neighbour)
+                if not walls & 0b1000:
+                    neighbour = index - 1
+                    if distances[neighbour] < 0:
+                        distances[neighbour] = depth
+                        parents[neighbour] = index
+                        reached.append(neighbour)
+            frontier = reached
+
+        self._field_origin = start
+        self.field_expanded = expanded
+        return distances
+
+    def path_to(
+            self,
+            target: tuple[int, int],
+            origin: tuple[int, int] | None = None
+            ) -> list[tuple[int, int]]:
+        """Return the shortest path from ``origin`` (the entry by
+        default) to ``target``, or an empty list if it is unreachable."""
+        distances = self.distance_field(origin)
+        width = self.width
+        index = target[1] * width + target[0]
+        if distances[index] < 0:
+            return []
+        parents = self.parents
+        path = []
+        while index >= 0:
+            path.append((index % width, index // width))
+            index = parents[index]
         path.reverse()
         return path
 
+    def farthest_cell(
+            self,
+            origin: tuple[int, int] | None = None
+            ) -> tuple[tuple[int, int], int]:
+        """Return the reachable cell farthest from ``origin`` (the entry
+        by default) and its distance."""
+        distances = self.distance_field(origin)
+        longest = max(distances)
+        index = distances.index(longest)
+        return (index % self.width, index // self.width), longest
+
     def Drawing_solution_path(
             self,
             path: list[tuple[int, int]] | None
@@ -286,116 +520,313 @@ class MazeGenerator:
                     directins.append("N")
         return directins
 
+    def write_hex(self, output: TextIO, directions: list[str]) -> None:
+        """Write the maze, entry, exit and solution in the hexadecimal
+        output format."""
+        with self.phase("write"):
+            digits = self.cells.translate(HEX_DIGITS).decode("ascii")
+            width = self.width
+            rows = [digits[y * width:(y + 1) * width]
+                    for y in range(self.height)]
+            written = output.write("\n".join(rows) + "\n\n")
+            written += output.write(f"{self.entry[0]},{self.entry[1]}\n")
+            written += output.write(f"{self.exit[0]},{self.exit[1]}\n")
+            written += output.write(''.join(directions))
+        if self.profile is not None:
+            self.profile.bytes_written += written
+
     def animate_solution_path(
         self,
         color: str,
         path: list[tuple[int, int]],
-        delay: float = 0.08
+        delay: float = 0.08,
+        fps: int = 30
     ) -> None:
-        """Animate the solution path from entry to exit."""
-        animated: list[tuple[int, int]] = []
+        """Animate the solution path from entry to exit.
 
-        for step in path:
-            animated.append(step)
-            print("\033[H\033[J", end="")
-            self.draw_maze(color, animated)
-            time.sleep(delay)
+        The maze is drawn once, then each step only repaints the cells
+        whose glyphs depend on the new path cell."""
+        on_path: set[tuple[int, int]] = set()
+
+        def patches() -> Iterator[str]:
+            for x, y in path:
+                on_path.add((x, y))
+                yield self._repaint(
+                    ((x, y), (x + 1, y), (x, y - 1)), color, on_path)
+
+        sys.stdout.write("\033[H\033[J" + self.render_maze(color, None))
+        self._play(patches(), delay, fps)
+
+    def load_cells(self, cells: bytes | bytearray) -> None:
+        """Replace the wall buffer with already generated walls."""
+        self.cells[:] = cells
+        self.visited[:] = b"\x01" * len(self.visited)
+        self._field_origin = None
+
+    def _close_walls(self) -> None:
+        """Close every wall with a slice copy of a kept template."""
+        if len(self._closed) != len(self.cells):
+            self._closed = b"\x0f" * len(self.cells)
+        self.cells[:] = self._closed
+        self._field_origin = None
 
     def reset_grid_walls(self) -> None:
         """Reset all cells to initial wall state"""
-        for y in range(self.height):
-            for x in range(self.width):
-                cell = self.grid[y][x]
-                cell.walls = 0b1111
-                cell.is_visited = False
+        self._close_walls()
+        self.remove_visited_walls()
+
+    def reset(self, seed: int | None = None) -> None:
+        """Close every wall again and reseed the generator, reusing
+        the wall, visited and solver buffers of this maze."""
+        self.seed = seed
+        self.rng.seed(seed)
+        self._close_walls()
+        self.visited[:] = self.mask
+        self.generation_steps.clear()
+        self.solve_stats = None
+
+    def regenerate(self, seed: int | None = None,
+                   algo: str | None = None) -> None:
+        """Carve a new maze in place with ``seed`` (random if None) and
+        ``algo`` (the last algorithm used by default).
+
+        Walls and visited flags are reset with slice copies from
+        buffers kept between runs, and the BFS distance and parent
+        arrays are reused. Back-to-back regenerations of a large maze
+        therefore allocate almost nothing outside the carving itself."""
+        self.reset(seed)
+        self.generate(algo or self.algo or "dfs")
 
     def display_maze(
             self,
             color: str = "\033[37m",
             path: list[tuple[int, int]] | None = None,
-            delay: float = 0.01) -> None:
-        """control the display if with animation or not ."""
-        if self.anim and self.generation_steps:
-            self.reset_grid_walls()
-            for x, y, direction in self.generation_steps:
-                self.remove_opposite_wall(x, y, direction)
-                print("\033[H\033[J", end="")
-                self.draw_maze(color, None)
-                time.sleep(delay)
-            print('\033c', end="")
-            self.draw_maze(color, path)
-
-            self.generation_steps.clear()
+            delay: float = 0.01,
+            fps: int = 30) -> None:
+        """control the display if with animation or not .
+
+        The first display after an animated generation replays it; the
+        step log is kept, so ``replay`` can play it again later."""
+        if self._replay_pending and self.generation_steps:
+            self._replay_pending = False
+            self.replay(color, path, delay, fps)
             return
         self.draw_maze(color, None)
 
+    def seek(self, step: int) -> None:
+        """Put the walls in their state after the first ``step``
+        carving steps of ``generation_steps``, applied in bulk."""
+        self._close_walls()
+        self.generation_steps.apply(self.cells, 0, step)
+
+    def replay(
+            self,
+            color: str = "\033[37m",
+            path: list[tuple[int, int]] | None = None,
+            delay: float = 0.01,
+            fps: int = 30,
+            start: int = 0,
+            stop: int | None = None) -> None:
+        """Animate the generation from step ``start`` to ``stop``.
+
+        The maze jumps to ``start`` with ``seek`` and is drawn once, then
+        each step repaints only the two cells it touches. The generated
+        walls are put back at the end."""
+        final = bytes(self.cells)
+        offsets = {"N": (0, -1), "E": (1, 0), "S": (0, 1), "W": (-1, 0)}
+        self.seek(start)
+
+        def patches() -> Iterator[str]:
+            for x, y, direction in self.generation_steps.between(start,
+                                                                 stop):
+                self.remove_opposite_wall(x, y, direction)
+                dx, dy = offsets[direction]
+                yield self._repaint(((x, y), (x + dx, y + dy)),
+                                    color, set())
+
+        sys.stdout.write("\033[H\033[J" + self.render_maze(color, None))
+        self._play(patches(), delay, fps)
+        self.cells[:] = final
+        self._field_origin = None
+        print('\033c', end="")
+        self.draw_maze(color, path)
+
+    def _repaint(
+            self,
+            cells: Iterable[tuple[int, int]],
+            color: str,
+            on_path: set[tuple[int, int]]
+            ) -> str:
+        """Return the escape sequences that redraw the given cells in
+        place on a frame drawn from the top-left corner."""
+        patch = []
+        for x, y in cells:
+            if not self.check_available_wall(x, y):
+                continue
+            column = 4 * x + 1
+            patch.append(f"\033[{2 * y + 2};{column}H")
+            patch.append(self._cell_glyph(x, y, color, on_path))
+            patch.append(f"\033[{2 * y + 3};{column}H")
+            patch.append(self._south_glyph(x, y, color, on_path))
+        return "".join(patch)
+
+    def _play(self, patches: Iterator[str], delay: float, fps: int) -> None:
+        """Write animation patches, one step every ``delay`` seconds,
+        batching the steps that fall within the same 1/fps frame."""
+        frame_time = 1 / fps
+        pending: list[str] = []
+        start = last = time.perf_counter()
+        for step, patch in enumerate(patches, 1):
+            pending.append(patch)
+            due = start + step * delay
+            now = time.perf_counter()
+            if due - last >= frame_time or now - last >= frame_time:
+                sys.stdout.write("".join(pending))
+                sys.stdout.flush()
+                pending.clear()
+                if due > now:
+                    time.sleep(due - now)
+                last = time.perf_counter()
+        sys.stdout.write("".join(pending))
+        sys.stdout.write(f"\033[{2 * self.height + 2};1H")
+        sys.stdout.flush()
+
     def draw_maze(self, color: str,
                   path: list[tuple[int, int]] | None = None) -> None:
-        """Display the maze in the terminal."""
-
-        wall_42 = self.Draw_42()
-        RESET = "\033[0m"
-        print(color + "█" + "████" * self.width + RESET)
-        wall_42_is_excite = True
-        if self.height < 10 or self.width < 10:
-            wall_42_is_excite = False
+        """Display the maze in the terminal with a single write."""
+        with self.phase("draw"):
+            sys.stdout.write(self.render_maze(color, path))
+            sys.stdout.flush()
+
+    def render_maze(self, color: str,
+                    path: list[tuple[int, int]] | None = None) -> str:
+        """Build the terminal frame of the maze as one string."""
+        on_path = set(path) if path else set()
+        frame = [color + "█" + "████" * self.width + RESET + "\n"]
         for y in range(self.height):
             for x in range(self.width):
-                cell = self.grid[y][x]
-                if (x, y) == self.entry:
-                    if cell.walls & 0b1000:
-                        print(color + "█🟢 " + RESET, end="")
-                    else:
-                        print(" 🟢 ", end="")
-
-                elif (wall_42_is_excite and wall_42 is not None
-                      and (y, x) in wall_42):
-
-                    print(color + "█" + RESET, end="")
-                    print("\033[90m" "███" + RESET, end="")
-                elif (x, y) == self.exit:
-                    if cell.walls & 0b1000:
-                        print(color + "█🔴 " + RESET, end="")
-                    else:
-                        print("🔴  ", end="")
-                elif cell.walls & 0b1000:
-                    if path is not None and (x, y) in path:
-                        print(color + "█" + RESET, end="")
-                        print("\033[32m" "███" + RESET, end="")
-                    else:
-                        print(color + "█" + RESET, end="")
-                        print("   ", end="")
-                elif cell.walls & 0b1000 == 0:
-                    if path is not None and (x, y) in path:
-                        if (x - 1, y) not in path:
-                            print("\033[32m" " ███" + RESET, end="")
-                        else:
-                            print("\033[32m" "████" + RESET, end="")
-                    else:
-                        print(" ", end="")
-                        print("   ", end="")
-
-            print(color + "█" + RESET)
+                frame.append(self._cell_glyph(x, y, color, on_path))
+            frame.append(color + "█" + RESET + "\n")
             for x in range(self.width):
-                cell = self.grid[y][x]
-                if cell.walls & 0b0100:
-                    print(color + "████" + RESET, end="")
-                else:
-                    if path is not None and (x, y) in path:
-                        if (x, y + 1) not in path:
-                            print(color + "█" + "\033[32m" + "   " + RESET,
-                                  end="")
-                        else:
-                            print(color + "█" + "\033[32m" + "███" + RESET,
-                                  end="")
-                    else:
-                        print(color + "█   " + RESET, end="")
-            print(color + "█" + RESET)
+                frame.append(self._south_glyph(x, y, color, on_path))
+            frame.append(color + "█" + RESET + "\n")
+        return "".join(frame)
+
+    def _cell_glyph(
+            self,
+            x: int,
+            y: int,
+            color: str,
+            on_path: set[tuple[int, int]]
+            ) -> str:
+        """Return the 4-column glyph of a cell and its west wall."""
+        index = y * self.width + x
+        west = self.cells[index] & 0b1000
+        if (x, y) == self.entry:
+            return color + "█🟢 " + RESET if west else " 🟢 "
+        if self.mask[index]:
+            return color + "█" + RESET + "\033[90m" "███" + RESET
+        if (x, y) == self.exit:
+            return color + "█🔴 " + RESET if west else "🔴  "
+        if west:
+            if (x, y) in on_path:
+                return color + "█" + RESET + "\033[32m" "███" + RESET
+            return color + "█" + RESET + "   "
+        if (x, y) in on_path:
+            if (x - 1, y) not in on_path:
+                return "\033[32m" " ███" + RESET
+            return "\033[32m" "████" + RESET
+        return "    "
+
+    def _south_glyph(
+            self,
+            x: int,
+            y: int,
+            color: str,
+            on_path: set[tuple[int, int]]
+            ) -> str:
+        """Return the 4-column glyph of the wall below a cell."""
+        if self.cells[y * self.width + x] & 0b0100:
+            return color + "████" + RESET
+        if (x, y) in on_path:
+            if (x, y + 1) not in on_path:
+                return color + "█" + "\033[32m" + "   " + RESET
+            return color + "█" + "\033[32m" + "███" + RESET
+        return color + "█   " + RESET
+
+
+class Grid:
+    """Row-indexed view over the maze buffers, kept so that
+    ``grid[y][x].walls`` style access keeps working."""
+    __slots__ = ("maze",)
+
+    def __init__(self, maze: MazeGenerator) -> None:
+        """Initialize a view over the given maze."""
+        self.maze = maze
+
+    def __len__(self) -> int:
+        return self.maze.height
+
+    def __getitem__(self, y: int) -> "Row":
+        if y < 0:
+            y += self.maze.height
+        if not 0 <= y < self.maze.height:
+            raise IndexError("grid row out of range")
+        return Row(self.maze, y)
+
+    def __iter__(self) -> Iterator["Row"]:
+        for y in range(self.maze.height):
+            yield Row(self.maze, y)
+
+
+class Row:
+    """View over a single row of the maze buffers."""
+    __slots__ = ("maze", "y")
+
+    def __init__(self, maze: MazeGenerator, y: int) -> None:
+        """Initialize a view over row ``y`` of the given maze."""
+        self.maze = maze
+        self.y = y
+
+    def __len__(self) -> int:
+        return self.maze.width
+
+    def __getitem__(self, x: int) -> "Cell":
+        if x < 0:
+            x += self.maze.width
+        if not 0 <= x < self.maze.width:
+            raise IndexError("grid column out of range")
+        return Cell(self.maze, self.y * self.maze.width + x)
+
+    def __iter__(self) -> Iterator["Cell"]:
+        start = self.y * self.maze.width
+        for index in range(start, start + self.maze.width):
+            yield Cell(self.maze, index)
 
 
 class Cell:
-    """Represent a single cell in the maze grid."""
-    def __init__(self) -> None:
-        """Initialize a maze cell."""
-        self.walls = 0b1111
-        self.is_visited = False
+    """View over a single cell of the maze buffers."""
+    __slots__ = ("maze", "index")
+
+    def __init__(self, maze: MazeGenerator, index: int) -> None:
+        """Initialize a view over the cell at flat ``index``."""
+        self.maze = maze
+        self.index = index
+
+    @property
+    def walls(self) -> int:
+        return self.maze.cells[self.index]
+
+    @walls.setter
+    def walls(self, value: int) -> None:
+        self.maze.cells[self.index] = value
+        self.maze._field_origin = None
+
+    @property
+    def is_visited(self) -> bool:
+        return bool(self.maze.visited[self.index])
+
+    @is_visited.setter
+    def is_visited(self, value: bool) -> None:
+        self.maze.visited[self.index] = value
+        self.maze._field_origin = None
@@ -0,0 +1,192 @@
+import mmap
+import struct
+import sys
+from typing import TYPE_CHECKING, BinaryIO
+
+from .loader import parse_hex
+from .walls import HEX_DIGITS
+
+if TYPE_CHECKING:
+    from .mazegen import MazeGenerator
+
+
+MAGIC = b"AMZ1"
+HEADER = struct.Struct("<4s6IqB15sI")
+MOVES = "NESW"
+LOW_NIBBLE = bytes(value & 0x0F for value in range(256))
+HIGH_NIBBLE = bytes(value >> 4 for value in range(256))
+SHIFT_NIBBLE = bytes((value << 4) & 0xFF for value in range(256))
+
+
+def pack_cells(cells: bytes | bytearray) -> bytes:
+    """Pack wall nibbles two cells per byte, even cells in the low
+    nibble."""
+    even = cells[0::2]
+    odd = cells[1::2].translate(SHIFT_NIBBLE)
+    packed = int.from_bytes(even, "little") | int.from_bytes(odd, "little")
+    return packed.to_bytes(len(even), "little")
+
+
+def unpack_cells(packed: bytes, size: int) -> bytearray:
+    """Expand ``size`` wall nibbles packed by ``pack_cells``."""
+    cells = bytearray(2 * len(packed))
+    cells[0::2] = packed.translate(LOW_NIBBLE)
+    cells[1::2] = packed.translate(HIGH_NIBBLE)
+    del cells[size:]
+    return cells
+
+
+def pack_moves(directions: list[str] | str) -> bytes:
+    """Pack N/E/S/W moves four per byte, two bits each."""
+    packed = bytearray((len(directions) + 3) // 4)
+    for index, move in enumerate(directions):
+        packed[index >> 2] |= MOVES.index(move) << (2 * (index & 3))
+    return bytes(packed)
+
+
+def unpack_moves(packed: bytes, count: int) -> str:
+    """Expand ``count`` moves packed by ``pack_moves``."""
+    return "".join(MOVES[(packed[index >> 2] >> (2 * (index & 3))) & 3]
+                   for index in range(count))
+
+
+def write_packed(
+        output: BinaryIO,
+        width: int,
+        height: int,
+        cells: bytes | bytearray,
+        entry: tuple[int, int],
+        exit: tuple[int, int],
+        directions: list[str] | str,
+        seed: int | None = None,
+        algo: str = ""
+        ) -> int:
+    """Write a maze in the packed binary format: a fixed header, the
+    wall nibbles two cells per byte, then the solution moves. Returns
+    the number of bytes written."""
+    if seed is not None and not -2 ** 63 <= seed < 2 ** 63:
+        raise ValueError("the packed format stores 64-bit seeds only")
+    written = output.write(HEADER.pack(
+        MAGIC, width, height, entry[0], entry[1], exit[0], exit[1],
+        seed or 0, seed is not None, algo.encode("ascii"), len(directions)))
+    written += output.write(pack_cells(cells))
+    written += output.write(pack_moves(directions))
+    return written
+
+
+def write_maze(output: BinaryIO, maze: "MazeGenerator",
+               directions: list[str]) -> None:
+    """Write a generated maze in the packed binary format."""
+    with maze.phase("write"):
+        written = write_packed(output, maze.width, maze.height, maze.cells,
+                               maze.entry, maze.exit, directions, maze.seed,
+                               maze.algo)
+    if maze.profile is not None:
+        maze.profile.bytes_written += written
+
+
+class PackedMaze:
+    """Read-only, memory-mapped view of a packed maze file.
+
+    Only the header is decoded on open; cell queries read the one byte
+    they need from the mapping."""
+
+    def __init__(self, filename: str) -> None:
+        """Map ``filename`` and decode its header."""
+        self._file = open(filename, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._file.close()
+            raise ValueError(f"{filename} is not a packed maze file")
+        try:
+            (magic, self.width, self.height, entry_x, entry_y, exit_x,
+             exit_y, seed, has_seed, algo, self.move_count) = \
+                HEADER.unpack_from(self._map)
+            if magic != MAGIC:
+                raise ValueError(f"{filename} is not a packed maze file")
+            self.algo = algo.rstrip(b"\0").decode("ascii")
+        except (struct.error, ValueError):
+            self.close()
+            raise ValueError(f"{filename} is not a packed maze file")
+        self.entry = (entry_x, entry_y)
+        self.exit = (exit_x, exit_y)
+        self.seed = seed if has_seed else None
+        self._moves_at = HEADER.size + (self.width * self.height + 1) // 2
+        if len(self._map) < self._moves_at + (self.move_count + 3) // 4:
+            self.close()
+            raise ValueError(f"{filename} is truncated")
+
+    def walls(self, x: int, y: int) -> int:
+        """Return the wall bits of cell (x, y)."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError("cell out of range")
+        index = y * self.width + x
+        byte: int = self._map[HEADER.size + (index >> 1)]
+        return byte >> 4 if index & 1 else byte & 0x0F
+
+    def cells(self) -> bytearray:
+        """Decode the whole wall buffer."""
+        return unpack_cells(self._map[HEADER.size:self._moves_at],
+                            self.width * self.height)
+
+    def moves(self) -> str:
+        """Decode the solution moves."""
+        end = self._moves_at + (self.move_count + 3) // 4
+        return unpack_moves(self._map[self._moves_at:end], self.move_count)
+
+    def close(self) -> None:
+        """Release the mapping and the file."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "PackedMaze":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def hex_to_packed(source: str, target: str) -> None:
+    """Convert a maze file from the hexadecimal text format to the
+    packed binary format."""
+    with open(source, "rb") as text:
+        maze = parse_hex(text.read())
+    with open(target, "wb") as output:
+        write_packed(output, maze.width, maze.height, maze.cells,
+                     maze.entry, maze.exit, maze.directions)
+
+
+def packed_to_hex(source: str, target: str) -> None:
+    """Convert a maze file from the packed binary format to the
+    hexadecimal text format."""
+    with PackedMaze(source) as maze:
+        digits = maze.cells().translate(HEX_DIGITS).decode("ascii")
+        width = maze.width
+        rows = [digits[y * width:(y + 1) * width]
+                for y in range(maze.height)]
+        with open(target, "w") as output:
+            output.write("\n".join(rows) + "\n\n")
+            output.write(f"{maze.entry[0]},{maze.entry[1]}\n")
+            output.write(f"{maze.exit[0]},{maze.exit[1]}\n")
+            output.write(maze.moves())
+
+
+def main() -> None:
+    """Convert between the text and packed formats, picking the
+    direction from the source file's magic number."""
+    if len(sys.argv) != 3:
+        print("Usage: python3 -m mazegen.packed SOURCE TARGET")
+        sys.exit(1)
+    source, target = sys.argv[1], sys.argv[2]
+    with open(source, "rb") as check:
+        packed = check.read(len(MAGIC)) == MAGIC
+    if packed:
+        packed_to_hex(source, target)
+    else:
+        hex_to_packed(source, target)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import re
+from array import array
+
+
+PBM_BITS = bytes.maketrans(b"01", b"\x00\x01")
+PBM_RAW_HEADER = re.compile(rb"P4(?:\s|#[^\n]*\n)+(\d+)(?:\s|#[^\n]*\n)+"
+                            rb"(\d+)\s")
+
+
+def pattern_42(width: int, height: int) -> list[tuple[int, int]] | None:
+    """Return the (row, column) cells of the '42' pattern centred in a
+    ``width`` x ``height`` maze, or None if the maze is too small."""
+    if height >= 10 and width >= 10:
+        w = int((width - 7) / 2)
+        h = int((height - 5) / 2)
+        return [(h, w), (h+1, w),
+                (h+2, w), (h+2, w+1),
+                (h+2, w+2), (h+1, w+2),
+                (h, w+2), (h+3, w+2),
+                (h+4, w+2), (h+4, w+4),
+                (h+4, w+5), (h+4, w+6),
+                (h+3, w+4), (h+2, w+4),
+                (h+2, w+5), (h+2, w+6),
+                (h+1, w+6), (h, w+6),
+                (h, w+5), (h, w+4)]
+    return None
+
+
+def blocked_rows(
+        cells: list[tuple[int, int]] | None
+        ) -> dict[int, set[int]]:
+    """Group (row, column) pattern cells into a row -> columns mapping."""
+    rows: dict[int, set[int]] = {}
+    for y, x in cells or ():
+        rows.setdefault(y, set()).add(x)
+    return rows
+
+
+def pattern_mask(
+        width: int,
+        height: int,
+        cells: list[tuple[int, int]] | None
+        ) -> bytearray:
+    """Return a ``width * height`` buffer with 1 for every (row, column)
+    pattern cell and 0 elsewhere, indexed by ``y * width + x``."""
+    mask = bytearray(width * height)
+    for y, x in cells or ():
+        mask[y * width + x] = 1
+    return mask
+
+
+def mask_cells(mask: bytes | bytearray, width: int) -> list[tuple[int, int]]:
+    """Return the (row, column) cells set in ``mask``."""
+    cells = []
+    index = mask.find(1)
+    while index >= 0:
+        cells.append(divmod(index, width))
+        index = mask.find(1, index + 1)
+    return cells
+
+
+def _pbm_tokens(data: bytes) -> list[bytes]:
+    """Split a PBM header or ASCII raster into tokens, dropping
+    comments."""
+    tokens = []
+    for line in data.split(b"\n"):
+        tokens.extend(line.split(b"#", 1)[0].split())
+    return tokens
+
+
+def read_bitmap(data: bytes) -> list[bytes]:
+    """Decode a pattern into rows of 0/1 bytes, 1 meaning blocked.
+
+    PBM images (``P1`` plain or ``P4`` raw) are read with black pixels
+    blocked. Anything else is taken as text, one row per line, where
+    '.', '0' and spaces are free and any other character is blocked."""
+    if data[:2] == b"P1":
+        tokens = _pbm_tokens(data[2:])
+        columns, rows = int(tokens[0]), int(tokens[1])
+        bits = b"".join(tokens[2:])
+        if len(bits) < columns * rows:
+            raise ValueError("truncated PBM image")
+        return [bits[y * columns:(y + 1) * columns].translate(PBM_BITS)
+                for y in range(rows)]
+    header = PBM_RAW_HEADER.match(data)
+    if header is not None:
+        columns, rows = int(header[1]), int(header[2])
+        stride = (columns + 7) // 8
+        raster = data[header.end():]
+        if len(raster) < stride * rows:
+            raise ValueError("truncated PBM image")
+        return [bytes((raster[y * stride + x // 8] >> (7 - x % 8)) & 1
+                      for x in range(columns))
+                for y in range(rows)]
+    lines = data.decode("utf-8").splitlines()
+    while lines and not lines[-1].strip():
+        lines.pop()
+    columns = max((len(line) for line in lines), default=0)
+    return [bytes(0 if char in ".0 " else 1 for char in line.ljust(columns))
+            for line in lines]
+
+
+def fit_pattern(rows: list[bytes], width: int, height: int) -> bytearray:
+    """Centre a bitmap in a ``width`` x ``height`` mask.
+
+    Patterns that fit are stamped one pixel per cell; bigger ones are
+    shrunk with nearest-neighbour sampling, keeping their aspect ratio,
+    to leave a free one-cell border around them."""
+    mask = bytearray(width * height)
+    if not rows or not rows[0]:
+        return mask
+    source_height, source_width = len(rows), len(rows[0])
+    scaled_width, scaled_height = source_width, source_height
+    if source_width > width or source_height > height:
+        factor = min((width - 2) / source_width,
+                     (height - 2) / source_height)
+        scaled_width = max(1, int(source_width * factor))
+        scaled_height = max(1, int(source_height * factor))
+    left = (width - scaled_width) // 2
+    top = (height - scaled_height) // 2
+    columns = [x * source_width // scaled_width for x in range(scaled_width)]
+    for y in range(scaled_height):
+        source = rows[y * source_height // scaled_height]
+        start = (top + y) * width + left
+        mask[start:start + scaled_width] = bytes(source[x] for x in columns)
+    return mask
+
+
+def free_regions(mask: bytes | bytearray,
+                 width: int) -> tuple[array, list[int]]:
+    """Label the 4-connected regions of free cells in ``mask``.
+
+    Returns the label of every cell (regions are numbered from 0 in
+    index order, -1 for blocked cells) and the size of each region."""
+    size = len(mask)
+    label = array("i", [-1]) * size
+    sizes: list[int] = []
+    for start in range(size):
+        if mask[start] or label[start] >= 0:
+            continue
+        region = len(sizes)
+        label[start] = region
+        stack = [start]
+        count = 0
+        while stack:
+            index = stack.pop()
+            count += 1
+            x = index % width
+            for neighbour, inside in ((index - width, index >= width),
+                                      (index + 1, x < width - 1),
+                                      (index + width, index + width < size),
+                                      (index - 1, x > 0)):
+                if inside and not mask[neighbour] and label[neighbour] < 0:
+                    label[neighbour] = region
+                    stack.append(neighbour)
+        sizes.append(count)
+    return label, sizes
+
+
+def fill_enclosed(mask: bytearray, width: int) -> None:
+    """Block every free cell that is cut off from the largest free
+    region, so that a single maze can reach all the remaining cells."""
+    label, sizes = free_regions(mask, width)
+    if len(sizes) < 2:
+        return
+    largest = sizes.index(max(sizes))
+    for index in range(len(mask)):
+        if not mask[index] and label[index] != largest:
+            mask[index] = 1
+
+
+def load_pattern(filename: str, width: int, height: int) -> bytearray:
+    """Read a text or PBM pattern file into a mask for a ``width`` x
+    ``height`` maze, blocking any region the pattern encloses."""
+    with open(filename, "rb") as source:
+        rows = read_bitmap(source.read())
+    mask = fit_pattern(rows, width, height)
+    fill_enclosed(mask, width)
+    return mask
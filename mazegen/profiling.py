@@ -0,0 +1,46 @@
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Iterator, TextIO
+
+
+@dataclass(slots=True)
+class Profile:
+    """Counters filled in by a MazeGenerator built with ``profile=``.
+
+    ``phases`` maps a phase name (generate, loops, solve, draw, write)
+    to the wall time spent in it, summed over every run that shares this
+    object."""
+    phases: dict[str, float] = field(default_factory=dict)
+    cells_carved: int = 0
+    frontier_peak: int = 0
+    nodes_expanded: int = 0
+    bytes_written: int = 0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the wall time of the ``with`` block to phase ``name``."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) \
+                + time.perf_counter() - started
+
+    @property
+    def cells_per_second(self) -> float:
+        """Cells carved per second of generation."""
+        seconds = self.phases.get("generate", 0.0)
+        return self.cells_carved / seconds if seconds else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters as plain JSON-ready values."""
+        stats = asdict(self)
+        stats["cells_per_second"] = self.cells_per_second
+        return stats
+
+    def dump(self, output: TextIO) -> None:
+        """Write the counters as JSON."""
+        json.dump(self.as_dict(), output, indent=1)
+        output.write("\n")
@@ -0,0 +1,207 @@
+import heapq
+import time
+from array import array
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable
+
+from .walls import EAST, NORTH, SOUTH, WEST, closed_border
+
+if TYPE_CHECKING:
+    from .mazegen import MazeGenerator
+
+
+OPEN_COUNT = bytes(4 - bin(walls & 0b1111).count("1")
+                   for walls in range(256))
+
+
+@dataclass(slots=True)
+class SolveStats:
+    """Cost of one solver run."""
+    method: str
+    nodes_expanded: int
+    seconds: float
+    length: int
+
+
+def _moves(width: int) -> tuple[tuple[int, int], ...]:
+    """Return the (wall bit, index offset) pair of every direction."""
+    return ((NORTH, -width), (EAST, 1), (SOUTH, width), (WEST, -1))
+
+
+def _walk_back(parents: array, index: int) -> list[int]:
+    """Follow ``parents`` from ``index`` until a -1 entry."""
+    path = []
+    while index >= 0:
+        path.append(index)
+        index = parents[index]
+    return path
+
+
+def solve_bfs(maze: "MazeGenerator", start: int,
+              goal: int) -> tuple[list[int], int]:
+    """Breadth-first search through the maze distance field. A field
+    still cached from an earlier search expands no node."""
+    width = maze.width
+    distances = maze.distance_field((start % width, start // width))
+    if distances[goal] < 0:
+        return [], maze.field_expanded
+    path = _walk_back(maze.parents, goal)
+    path.reverse()
+    return path, maze.field_expanded
+
+
+def solve_astar(maze: "MazeGenerator", start: int,
+                goal: int) -> tuple[list[int], int]:
+    """A* search with the Manhattan distance as heuristic."""
+    width = maze.width
+    cells = closed_border(maze.cells, width)
+    goal_x, goal_y = goal % width, goal // width
+    costs = array("i", [-1]) * len(cells)
+    parents = array("i", [-1]) * len(cells)
+    costs[start] = 0
+    heap = [(0, 0, start)]
+    expanded = 0
+    while heap:
+        _, cost, index = heapq.heappop(heap)
+        if cost > costs[index]:
+            continue
+        expanded += 1
+        if index == goal:
+            path = _walk_back(parents, goal)
+            path.reverse()
+            return path, expanded
+        walls = cells[index]
+        for bit, step in _moves(width):
+            if walls & bit:
+                continue
+            neighbour = index + step
+            known = costs[neighbour]
+            if known < 0 or cost + 1 < known:
+                costs[neighbour] = cost + 1
+                parents[neighbour] = index
+                guess = abs(neighbour % width - goal_x) \
+                    + abs(neighbour // width - goal_y)
+                heapq.heappush(heap, (cost + 1 + guess, cost + 1, neighbour))
+    return [], expanded
+
+
+def solve_bidirectional(maze: "MazeGenerator", start: int,
+                        goal: int) -> tuple[list[int], int]:
+    """Breadth-first search from both ends, growing the smaller frontier
+    one level at a time until the two searches meet."""
+    cells = closed_border(maze.cells, maze.width)
+    moves = _moves(maze.width)
+    if start == goal:
+        return [start], 1
+    sides = []
+    for origin in (start, goal):
+        depth = array("i", [-1]) * len(cells)
+        parents = array("i", [-1]) * len(cells)
+        depth[origin] = 0
+        sides.append((depth, parents, [origin]))
+    expanded = 0
+    while sides[0][2] and sides[1][2]:
+        grow = 0 if len(sides[0][2]) <= len(sides[1][2]) else 1
+        depth, parents, frontier = sides[grow]
+        other = sides[1 - grow][0]
+        best = -1
+        meeting = -1
+        reached = []
+        for index in frontier:
+            expanded += 1
+            walls = cells[index]
+            for bit, step in moves:
+                if walls & bit:
+                    continue
+                neighbour = index + step
+                if depth[neighbour] >= 0:
+                    continue
+                depth[neighbour] = depth[index] + 1
+                parents[neighbour] = index
+                reached.append(neighbour)
+                if other[neighbour] >= 0:
+                    total = depth[neighbour] + other[neighbour]
+                    if best < 0 or total < best:
+                        best, meeting = total, neighbour
+        sides[grow] = (depth, parents, reached)
+        if meeting >= 0:
+            forward = _walk_back(sides[0][1], meeting)
+            forward.reverse()
+            return forward + _walk_back(sides[1][1], meeting)[1:], expanded
+    return [], expanded
+
+
+def solve_dead_end_filling(maze: "MazeGenerator", start: int,
+                           goal: int) -> tuple[list[int], int]:
+    """Fill dead ends until only the corridors joining entry and exit
+    are left, then walk what remains."""
+    cells = closed_border(maze.cells, maze.width)
+    moves = _moves(maze.width)
+    degree = bytearray(cells.translate(OPEN_COUNT))
+    filled = bytearray(len(cells))
+    stack = [index for index in range(len(cells))
+             if degree[index] == 1 and index != start and index != goal]
+    expanded = 0
+    while stack:
+        index = stack.pop()
+        filled[index] = 1
+        expanded += 1
+        walls = cells[index]
+        for bit, step in moves:
+            if walls & bit:
+                continue
+            neighbour = index + step
+            if filled[neighbour]:
+                continue
+            degree[neighbour] -= 1
+            if degree[neighbour] == 1 and neighbour != start \
+                    and neighbour != goal:
+                stack.append(neighbour)
+
+    parents = array("i", [-1]) * len(cells)
+    filled[start] = 1
+    frontier = [start]
+    while frontier:
+        reached = []
+        for index in frontier:
+            expanded += 1
+            if index == goal:
+                path = _walk_back(parents, goal)
+                path.reverse()
+                return path, expanded
+            walls = cells[index]
+            for bit, step in moves:
+                neighbour = index + step
+                if not walls & bit and not filled[neighbour]:
+                    filled[neighbour] = 1
+                    parents[neighbour] = index
+                    reached.append(neighbour)
+        frontier = reached
+    return [], expanded
+
+
+SOLVERS: dict[str, Callable[["MazeGenerator", int, int],
+                            tuple[list[int], int]]] = {
+    "bfs": solve_bfs,
+    "astar": solve_astar,
+    "bidirectional": solve_bidirectional,
+    "dead_end": solve_dead_end_filling,
+}
+
+
+def solve(
+        maze: "MazeGenerator",
+        method: str = "bfs"
+        ) -> tuple[list[tuple[int, int]], SolveStats]:
+    """Solve the maze from entry to exit with the named solver and
+    report how much work it did."""
+    if method not in SOLVERS:
+        raise ValueError(f"unknown solver: {method}")
+    width = maze.width
+    start = maze.entry[1] * width + maze.entry[0]
+    goal = maze.exit[1] * width + maze.exit[0]
+    began = time.perf_counter()
+    indices, expanded = SOLVERS[method](maze, start, goal)
+    seconds = time.perf_counter() - began
+    path = [(index % width, index // width) for index in indices]
+    return path, SolveStats(method, expanded, seconds, len(path))
@@ -0,0 +1,99 @@
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator
+
+
+MAGIC = b"AMS1"
+HEADER = struct.Struct("<4sIIQ")
+LETTERS = "NESW"
+CODES = {letter: code for code, letter in enumerate(LETTERS)}
+CLEAR = tuple(0b1111 ^ (1 << code) for code in range(4))
+
+
+class StepLog:
+    """Carving steps of a generation, packed in an ``array('I')`` as
+    ``index << 2 | direction`` (direction 0-3 for N, E, S, W), so a step
+    costs 4 bytes instead of a tuple.
+
+    It stands in for the former list of ``(x, y, "N")`` tuples:
+    ``append`` takes such a tuple and iterating yields them back."""
+
+    def __init__(self, width: int, height: int,
+                 packed: Iterable[int] = ()) -> None:
+        """Start a log for a ``width`` x ``height`` maze."""
+        self.width = width
+        self.height = height
+        self.packed = array("I", packed)
+
+    def append(self, step: tuple[int, int, str]) -> None:
+        """Record the carving of wall ``direction`` out of cell (x, y)."""
+        x, y, direction = step
+        self.packed.append((y * self.width + x) << 2 | CODES[direction])
+
+    def record(self, index: int, direction: int) -> None:
+        """Record a step from a flat cell index and a direction code."""
+        self.packed.append(index << 2 | direction)
+
+    def clear(self) -> None:
+        """Forget every step, keeping the log's storage."""
+        del self.packed[:]
+
+    def __len__(self) -> int:
+        return len(self.packed)
+
+    def __iter__(self) -> Iterator[tuple[int, int, str]]:
+        return self.between(0, None)
+
+    def between(self, start: int,
+                stop: int | None) -> Iterator[tuple[int, int, str]]:
+        """Yield the steps from ``start`` to ``stop`` as (x, y, "N")
+        tuples."""
+        width = self.width
+        for step in self.packed[start:stop]:
+            index = step >> 2
+            yield index % width, index // width, LETTERS[step & 3]
+
+    def apply(self, cells: bytearray, start: int = 0,
+              stop: int | None = None) -> None:
+        """Remove the walls carved by the steps from ``start`` to
+        ``stop`` from ``cells`` in one pass, without drawing anything."""
+        width = self.width
+        offsets = (-width, 1, width, -1)
+        for step in self.packed[start:stop]:
+            index = step >> 2
+            direction = step & 3
+            cells[index] &= CLEAR[direction]
+            cells[index + offsets[direction]] &= CLEAR[direction ^ 2]
+
+
+def save_steps(filename: str, log: StepLog) -> int:
+    """Write ``log`` to ``filename``: a header with the magic, the maze
+    size and the step count, then the packed steps little-endian.
+    Returns the number of bytes written."""
+    packed = log.packed
+    if sys.byteorder == "big":
+        packed = array("I", packed)
+        packed.byteswap()
+    with open(filename, "wb") as output:
+        written = output.write(HEADER.pack(MAGIC, log.width, log.height,
+                                           len(packed)))
+        packed.tofile(output)
+    return written + len(packed) * packed.itemsize
+
+
+def load_steps(filename: str) -> StepLog:
+    """Read a log written by ``save_steps``."""
+    with open(filename, "rb") as source:
+        header = source.read(HEADER.size)
+        if len(header) < HEADER.size or header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{filename} is not a step log")
+        _, width, height, count = HEADER.unpack(header)
+        log = StepLog(width, height)
+        data = source.read(count * log.packed.itemsize)
+    if len(data) != count * log.packed.itemsize:
+        raise ValueError(f"{filename} is truncated")
+    log.packed.frombytes(data)
+    if sys.byteorder == "big":
+        log.packed.byteswap()
+    return log
@@ -0,0 +1,180 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+from .mazegen import MazeGenerator
+from .pattern import free_regions
+from .walls import EAST, NORTH, SOUTH, WEST
+
+
+TILED_ALGOS = ("dfs", "prim")
+
+TileJob = tuple[int, int, int, bytes | None, str, int, bool, float]
+Borders = tuple[array, array, array, array]
+
+
+def carve_tile(job: TileJob) -> tuple[int, bytes, Borders | None]:
+    """Carve one tile in a worker process.
+
+    Returns the tile index, its wall bytes and, when the mask splits the
+    tile into several regions, the region label of its top, bottom, left
+    and right border cells (None means a single region)."""
+    index, width, height, mask, algo, seed, perfect, braid = job
+    tile = MazeGenerator(width, height, (0, 0), (width - 1, height - 1),
+                         perfect, seed, mask=mask or bytes(width * height))
+    tile.visited[:] = tile.mask
+    carve = tile.dfs if algo == "dfs" else tile.prim
+    start = tile.visited.find(0)
+    while start >= 0:
+        tile.visited[start] = 1
+        carve(start % width, start // width, False)
+        start = tile.visited.find(0, start + 1)
+    if not perfect:
+        tile.add_loops(braid, False)
+
+    borders = None
+    if mask is not None:
+        label, sizes = free_regions(mask, width)
+        if len(sizes) > 1:
+            borders = (label[:width], label[-width:],
+                       label[0::width], label[width - 1::width])
+    return index, bytes(tile.cells), borders
+
+
+def generate_tiled(
+        maze: MazeGenerator,
+        algo: str = "dfs",
+        tile_size: int = 512,
+        workers: int | None = None
+        ) -> None:
+    """Carve ``maze`` as a grid of square tiles on a process pool.
+
+    Each tile is carved with ``algo`` ("dfs" or "prim") and its own RNG,
+    seeded from ``maze.rng`` plus the tile index, into a spanning forest
+    of its free cells. The tiles are then joined with Kruskal's algorithm
+    over the (tile, region) pairs: one random opening per pair of touching
+    regions is a candidate, and the candidates are tried in random order,
+    so a perfect maze stays a single tree. The mask is respected, and
+    loops for imperfect mazes are added inside each tile.
+    ``tile_size`` must be at least 1."""
+    if algo not in TILED_ALGOS:
+        raise ValueError(f"tiled generation supports {TILED_ALGOS}, "
+                         f"not {algo}")
+    if tile_size < 1:
+        raise ValueError(f"the tile size must be at least 1, not "
+                         f"{tile_size}")
+    width, height = maze.width, maze.height
+    columns = -(-width // tile_size)
+    rows = -(-height // tile_size)
+    base = maze.rng.getrandbits(64)
+    mask = maze.mask
+    maze.algo = algo
+
+    jobs: list[TileJob] = []
+    for tile_y in range(rows):
+        for tile_x in range(columns):
+            left, top = tile_x * tile_size, tile_y * tile_size
+            tile_width = min(tile_size, width - left)
+            tile_height = min(tile_size, height - top)
+            tile_mask = b"".join(
+                mask[(top + y) * width + left:
+                     (top + y) * width + left + tile_width]
+                for y in range(tile_height))
+            jobs.append((len(jobs), tile_width, tile_height,
+                         tile_mask if 1 in tile_mask else None, algo,
+                         base + len(jobs), maze.perfect, maze.braid))
+
+    cells = bytearray(b"\x0f") * (width * height)
+    borders: list[Borders | None] = [None] * len(jobs)
+    with maze.phase("generate"):
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for index, walls, edges in pool.map(carve_tile, jobs):
+                tile_x, tile_y = index % columns, index // columns
+                left, top = tile_x * tile_size, tile_y * tile_size
+                tile_width = jobs[index][1]
+                for y in range(jobs[index][2]):
+                    start = (top + y) * width + left
+                    cells[start:start + tile_width] = \
+                        walls[y * tile_width:(y + 1) * tile_width]
+                borders[index] = edges
+        _join_tiles(maze, cells, tile_size, columns, rows, borders)
+        maze.load_cells(cells)
+    if maze.profile is not None:
+        maze.profile.cells_carved += len(cells) - mask.count(1)
+
+
+def _join_tiles(maze: MazeGenerator, cells: bytearray, tile_size: int,
+                columns: int, rows: int,
+                borders: list[Borders | None]) -> None:
+    """Open a spanning set of walls between the regions of neighbouring
+    tiles."""
+    width = maze.width
+    mask = maze.mask
+    rng = maze.rng
+    candidates = []
+    for index in range(columns * rows):
+        tile_x, tile_y = index % columns, index // columns
+        left, top = tile_x * tile_size, tile_y * tile_size
+        tile_width = min(tile_size, width - left)
+        tile_height = min(tile_size, maze.height - top)
+        if tile_x + 1 < columns:
+            border = [(top + y) * width + left + tile_width - 1
+                      for y in range(tile_height)]
+            candidates.extend(_pair_openings(
+                mask, border, EAST, 1, index, index + 1,
+                borders[index], 3, borders[index + 1], 2, rng.random))
+        if tile_y + 1 < rows:
+            border = [(top + tile_height - 1) * width + left + x
+                      for x in range(tile_width)]
+            candidates.extend(_pair_openings(
+                mask, border, SOUTH, width, index, index + columns,
+                borders[index], 1, borders[index + columns], 0, rng.random))
+    rng.shuffle(candidates)
+
+    root: dict[tuple[int, int], tuple[int, int]] = {}
+
+    def find(node: tuple[int, int]) -> tuple[int, int]:
+        root.setdefault(node, node)
+        while root[node] != node:
+            root[node] = root[root[node]]
+            node = root[node]
+        return node
+
+    for first, second, cell, bit, step in candidates:
+        a, b = find(first), find(second)
+        if a == b:
+            continue
+        root[a] = b
+        opposite = WEST if bit == EAST else NORTH
+        cells[cell] &= 0b1111 ^ bit
+        cells[cell + step] &= 0b1111 ^ opposite
+
+
+def _pair_openings(
+        mask: bytes | bytearray,
+        cells: list[int],
+        bit: int,
+        step: int,
+        tile: int,
+        other: int,
+        borders: Borders | None,
+        side: int,
+        other_borders: Borders | None,
+        other_side: int,
+        random: Callable[[], float]
+        ) -> list[tuple[tuple[int, int], tuple[int, int], int, int, int]]:
+    """Pick one random opening for every pair of regions that touch
+    across the border between ``tile`` and ``other``."""
+    here = borders[side] if borders is not None else None
+    there = other_borders[other_side] if other_borders is not None else None
+    best: dict[tuple[int, int], tuple[float, int]] = {}
+    for position, cell in enumerate(cells):
+        if mask[cell] or mask[cell + step]:
+            continue
+        pair = (here[position] if here is not None else 0,
+                there[position] if there is not None else 0)
+        draw = random()
+        if pair not in best or draw < best[pair][0]:
+            best[pair] = (draw, cell)
+    return [((tile, first), (other, second), cell, bit, step)
+            for (first, second), (_, cell) in best.items()]
@@ -0,0 +1,178 @@
+import importlib.util
+from typing import TYPE_CHECKING, Any
+
+from .walls import EAST, NORTH, SOUTH, WEST
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .mazegen import MazeGenerator
+
+
+# numpy is only imported by carve_vectorized, so ``import mazegen``
+# does not pay for it unless a NumPy engine actually runs.
+HAVE_NUMPY = importlib.util.find_spec("numpy") is not None
+VECTORIZED_ALGOS = ("binary_tree", "sidewinder")
+
+LETTERS = {NORTH: "N", EAST: "E", SOUTH: "S", WEST: "W"}
+OPPOSITE_BITS = {NORTH: SOUTH, EAST: WEST, SOUTH: NORTH, WEST: EAST}
+
+
+def carve_vectorized(maze: "MazeGenerator", algo: str) -> None:
+    """Carve the whole maze with a NumPy engine.
+
+    Cells already marked visited (the '42' pattern) are left closed.
+    Every algorithm produces one carving direction per cell, which forms
+    a forest; the trees cut off by the pattern are then joined with a
+    random spanning set of extra openings so the tree stays perfect."""
+    global np
+    if not HAVE_NUMPY:
+        raise RuntimeError(f"the '{algo}' algorithm requires numpy")
+    if algo not in VECTORIZED_ALGOS:
+        raise ValueError(f"unknown vectorized algorithm: {algo}")
+    import numpy as np
+
+    width, height = maze.width, maze.height
+    rng = np.random.default_rng(maze.rng.getrandbits(64))
+    grid = _Grid(width, height, maze.visited)
+
+    directions = _carve(grid, algo, rng)
+    walls = np.full(grid.size, 0b1111, dtype=np.uint8)
+    _open(grid, walls, directions, maze)
+    _join_components(grid, walls, directions, rng, maze)
+
+    maze.cells[:] = walls.tobytes()
+    maze.visited[:] = b"\x01" * grid.size
+
+
+class _Grid:
+    """Index arrays and open-neighbour masks shared by the engines."""
+
+    def __init__(self, width: int, height: int, visited: bytearray) -> None:
+        """Precompute the masks for a ``width`` x ``height`` grid whose
+        blocked cells are flagged in ``visited``."""
+        self.width = width
+        self.size = width * height
+        self.index = np.arange(self.size, dtype=np.int64)
+        self.x = self.index % width
+        self.y = self.index // width
+        self.blocked = np.frombuffer(bytes(visited), dtype=np.uint8) != 0
+
+        free = ~self.blocked
+        self.open_n = np.zeros(self.size, dtype=bool)
+        self.open_n[width:] = free[width:] & free[:-width]
+        self.open_e = np.zeros(self.size, dtype=bool)
+        self.open_e[:-1] = free[:-1] & free[1:]
+        self.open_e &= self.x < width - 1
+        self.offsets = {NORTH: -width, EAST: 1, SOUTH: width, WEST: -1}
+
+
+def _carve(grid: _Grid, algo: str, rng: Any) -> Any:
+    """Return the carving direction bit of every cell (0 for roots)."""
+    if algo == "binary_tree":
+        return _binary_tree(grid, rng)
+    return _sidewinder(grid, rng)
+
+
+def _binary_tree(grid: _Grid, rng: Any) -> Any:
+    """Binary Tree: every cell opens either north or east."""
+    coin = rng.random(grid.size) < 0.5
+    go_n = grid.open_n & (coin | ~grid.open_e)
+    go_e = grid.open_e & ~go_n
+    directions = np.zeros(grid.size, dtype=np.uint8)
+    directions[go_n] = NORTH
+    directions[go_e] = EAST
+    return directions
+
+
+def _sidewinder(grid: _Grid, rng: Any) -> Any:
+    """Sidewinder: rows are cut into runs, each run opens east along
+    itself and north from one random cell."""
+    index = grid.index
+    close = ~grid.open_e | ((rng.random(grid.size) < 0.5) & (grid.y > 0))
+    start = np.ones(grid.size, dtype=bool)
+    start[1:] = close[:-1]
+    run = np.cumsum(start) - 1
+    starts = np.flatnonzero(start)
+    ends = np.flatnonzero(close)
+
+    keys = np.where(grid.open_n, rng.permutation(grid.size), -1)
+    best = np.maximum.reduceat(keys, starts)
+    chosen = ends.copy()
+    picked = grid.open_n & (keys == best[run])
+    chosen[run[picked]] = index[picked]
+    pivot = chosen[run]
+
+    directions = np.zeros(grid.size, dtype=np.uint8)
+    directions[index < pivot] = EAST
+    directions[index > pivot] = WEST
+    directions[picked] = NORTH
+    return directions
+
+
+def _open(grid: _Grid, walls: Any, directions: Any,
+          maze: "MazeGenerator") -> None:
+    """Remove the wall on both sides of every carving direction."""
+    for bit, opposite in OPPOSITE_BITS.items():
+        cells = np.flatnonzero(directions == bit)
+        walls[cells] &= 0b1111 ^ bit
+        walls[cells + grid.offsets[bit]] &= 0b1111 ^ opposite
+    if maze.anim:
+        for cell in np.flatnonzero(directions).tolist():
+            maze.generation_steps.append(
+                (cell % grid.width, cell // grid.width,
+                 LETTERS[int(directions[cell])]))
+
+
+def _join_components(grid: _Grid, walls: Any, directions: Any, rng: Any,
+                     maze: "MazeGenerator") -> None:
+    """Connect the trees of the carved forest into a single tree."""
+    parent = grid.index.copy()
+    for bit, offset in grid.offsets.items():
+        moving = directions == bit
+        parent[moving] += offset
+    label = parent
+    while True:
+        jumped = label[label]
+        if np.array_equal(jumped, label):
+            break
+        label = jumped
+
+    width = grid.width
+    across = np.flatnonzero(grid.open_e)
+    down = np.flatnonzero(grid.open_n) - width
+    first = np.concatenate((across, down))
+    second = np.concatenate((across + 1, down + width))
+    bits = np.concatenate((np.full(across.size, EAST, dtype=np.uint8),
+                           np.full(down.size, SOUTH, dtype=np.uint8)))
+    crossing = label[first] != label[second]
+    if not crossing.any():
+        return
+
+    order = rng.permutation(np.flatnonzero(crossing))
+    first, second, bits = first[order], second[order], bits[order]
+    low = np.minimum(label[first], label[second])
+    high = np.maximum(label[first], label[second])
+    _, unique = np.unique(low * grid.size + high, return_index=True)
+    unique.sort()
+
+    root: dict[int, int] = {}
+
+    def find(node: int) -> int:
+        root.setdefault(node, node)
+        while root[node] != node:
+            root[node] = root[root[node]]
+            node = root[node]
+        return node
+
+    for edge in unique.tolist():
+        a, b = find(int(low[edge])), find(int(high[edge]))
+        if a == b:
+            continue
+        root[a] = b
+        cell, bit = int(first[edge]), int(bits[edge])
+        walls[cell] &= 0b1111 ^ bit
+        walls[cell + grid.offsets[bit]] &= 0b1111 ^ OPPOSITE_BITS[bit]
+        if maze.anim:
+            maze.generation_steps.append(
+                (cell % width, cell // width, LETTERS[bit]))
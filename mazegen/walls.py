@@ -0,0 +1,27 @@
+NORTH, EAST, SOUTH, WEST = 0b0001, 0b0010, 0b0100, 0b1000
+
+WALL_BITS = {"N": NORTH, "E": EAST, "S": SOUTH, "W": WEST}
+OPPOSITE = {"N": "S", "E": "W", "S": "N", "W": "E"}
+HEX_DIGITS = bytes.maketrans(bytes(range(16)), b"0123456789ABCDEF")
+CLOSE_WALL = {bit: bytes(value | bit for value in range(256))
+              for bit in (NORTH, EAST, SOUTH, WEST)}
+
+
+def closed_border(cells: bytearray, width: int) -> bytes | bytearray:
+    """Return the walls of ``cells`` with every outer wall closed.
+
+    The solvers step through open walls without bounds checks, so an
+    outer wall opened through ``remove_wall``, the grid view or an
+    unvalidated file would lead them off the grid. ``cells`` itself is
+    returned when the border is intact, which is the usual case, and a
+    patched copy otherwise."""
+    edges = ((slice(0, width), NORTH), (slice(width - 1, None, width), EAST),
+             (slice(len(cells) - width, None), SOUTH),
+             (slice(0, None, width), WEST))
+    if all(cells[edge] == cells[edge].translate(CLOSE_WALL[bit])
+           for edge, bit in edges):
+        return cells
+    patched = bytearray(cells)
+    for edge, bit in edges:
+        patched[edge] = patched[edge].translate(CLOSE_WALL[bit])
+    return patched
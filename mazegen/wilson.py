@@ -0,0 +1,104 @@
+from array import array
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from .mazegen import MazeGenerator
+
+
+FREE = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+SHIFTED = [bytes((value << shift) & 0xFF for value in range(256))
+           for shift in range(4)]
+
+
+def _allowed_moves(mask: bytes | bytearray, width: int) -> bytes:
+    """Return, per cell, the wall bits (N=1, E=2, S=4, W=8) of the moves
+    that stay inside the grid and off the mask.
+
+    Each direction is a shifted slice of the free-cell buffer and the
+    four are merged with one big-integer OR, so no Python loop runs per
+    cell."""
+    size = len(mask)
+    height = size // width
+    free = mask.translate(FREE)
+    north = bytearray(size)
+    north[width:] = free[:-width]
+    east = bytearray(size)
+    east[:-1] = free[1:]
+    east[width - 1::width] = bytes(height)
+    south = bytearray(size)
+    south[:-width] = free[width:]
+    west = bytearray(size)
+    west[1:] = free[:-1]
+    west[0::width] = bytes(height)
+    merged = 0
+    for shift, moves in enumerate((north, east, south, west)):
+        merged |= int.from_bytes(moves.translate(SHIFTED[shift]), "little")
+    return merged.to_bytes(size, "little")
+
+
+def _plant_roots(visited: bytearray, label: array, sizes: list[int],
+                 randrange: Callable[[int], int]) -> None:
+    """Mark one random cell of every free region as visited, so that
+    each walk can end inside its own region and the mask splitting the
+    grid yields a uniform spanning forest instead of a hang."""
+    targets = [randrange(count) for count in sizes]
+    for index, region in enumerate(label):
+        if region >= 0:
+            if targets[region] == 0:
+                visited[index] = 1
+            targets[region] -= 1
+
+
+def carve_wilson(maze: "MazeGenerator", animate: bool = True) -> None:
+    """Carve a uniform spanning tree of the free cells with Wilson's
+    algorithm.
+
+    The tree starts from one random free cell. Every cell still outside
+    it starts a random walk that stops on reaching the tree, and the
+    walk's loop-erased path is carved into the tree. The walk is
+    recorded in ``following``, one byte per cell holding the direction
+    it last left that cell by. Loops are therefore erased by
+    overwriting, without any bookkeeping. Moves are drawn with
+    ``maze.rng`` among precomputed allowed directions, and cells already
+    flagged in ``maze.visited`` (the mask) are never entered. When the
+    mask splits the free cells, every region gets its own root."""
+    cells = maze.cells
+    visited = maze.visited
+    width = maze.width
+    size = len(cells)
+    allowed = _allowed_moves(maze.mask, width)
+    offsets = (-width, 1, width, -1)
+    steps = maze.generation_steps
+    getrandbits = maze.rng.getrandbits
+
+    if visited.find(0) < 0:
+        return
+    label, sizes = maze.regions()
+    if len(sizes) > 1:
+        _plant_roots(visited, label, sizes, maze.rng.randrange)
+    else:
+        root = maze.rng.randrange(size)
+        while visited[root]:
+            root = maze.rng.randrange(size)
+        visited[root] = 1
+
+    following = bytearray(size)
+    start = visited.find(0)
+    while start >= 0:
+        index = start
+        while not visited[index]:
+            direction = getrandbits(2)
+            if allowed[index] >> direction & 1:
+                following[index] = direction
+                index += offsets[direction]
+        index = start
+        while not visited[index]:
+            direction = following[index]
+            neighbour = index + offsets[direction]
+            visited[index] = 1
+            cells[index] &= 0b1111 ^ (1 << direction)
+            cells[neighbour] &= 0b1111 ^ (1 << (direction ^ 2))
+            if animate:
+                steps.record(index, direction)
+            index = neighbour
+        start = visited.find(0, start + 1)
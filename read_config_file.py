@@ -1,36 +1,80 @@
 import sys
-from typing import Any
-
-
-def error(msg: str) -> None:
+from dataclasses import dataclass
+from typing import NoReturn
+
+
+class ConfigError(ValueError):
+    """Raised when a maze configuration is missing a key or has an
+    invalid value."""
+
+
+@dataclass(slots=True)
+class MazeConfig:
+    """Validated content of a maze configuration file."""
+    width: int
+    height: int
+    entry: tuple[int, int]
+    exit: tuple[int, int]
+    output_file: str
+    perfect: bool
+    seed: int | None = None
+    animate: bool = True
+    braid: float = 0.1
+    profile: bool = False
+    profile_file: str = "profile.json"
+    cache_dir: str | None = None
+    cache_size: int = 64
+    output_format: str = "hex"
+    pattern: str | None = None
+
+
+def error(msg: str) -> NoReturn:
     """ Display an error message and terminate the program."""
     print(f"Error: {msg}")
     sys.exit(1)
 
 
-def read_config() -> dict[str, Any]:
-    if len(sys.argv) != 2:
-        """ Read and validate the maze configuration file."""
-        error("Usage: python3 a_maze_ing.py config.txt")
+def _boolean(values: dict[str, str], key: str, default: bool,
+             message: str) -> bool:
+    """Parse a True/False value, case-insensitively."""
+    value = values.get(key)
+    if value is None:
+        return default
+    if value.lower() == "true":
+        return True
+    if value.lower() == "false":
+        return False
+    raise ConfigError(message)
 
-    filename = sys.argv[1]
 
+def _point(value: str, width: int, height: int, name: str) -> tuple[int, int]:
+    """Parse an ``x,y`` value that must lie inside the maze."""
     try:
-        file = open(filename, "r")
-    except (FileNotFoundError, PermissionError):
-        error(f"Cannot open config file: {filename}")
+        x, y = value.split(",")
+        point = (int(x), int(y))
+    except ValueError:
+        raise ConfigError("ENTRY and EXIT must be in format x,y")
+    if not (0 <= point[0] < width and 0 <= point[1] < height):
+        raise ConfigError(f"the {name} points are out of range")
+    return point
 
-    config: dict[str, Any] = {}
 
-    for line in file:
+def parse_config_text(text: str) -> MazeConfig:
+    """Parse and validate the text of a maze configuration.
+
+    The text is never taken for a file name, so it is safe on input
+    from other processes. Nothing is read from ``sys.argv`` and errors
+    raise ConfigError instead of exiting, so workers and tests can build
+    configs in memory."""
+    values: dict[str, str] = {}
+    for line in text.splitlines():
         line = line.strip()
         if not line or line.startswith("#"):
             continue
         if "=" not in line:
-            error(f"Invalid config line: {line}")
+            raise ConfigError(f"Invalid config line: {line}")
         key, value = line.split("=", 1)
-        config[key.strip()] = value.strip()
-    file.close()
+        values[key.strip()] = value.strip()
     required = [
         "WIDTH",
         "HEIGHT",
@@ -40,73 +84,92 @@ def read_config() -> dict[str, Any]:
         "PERFECT",
     ]
     for key in required:
-        if key not in config:
-            error(f"Missing required key: {key}")
+        if key not in values:
+            raise ConfigError(f"Missing required key: {key}")
     try:
-        config["WIDTH"] = int(config["WIDTH"])
-        config["HEIGHT"] = int(config["HEIGHT"])
+        width = int(values["WIDTH"])
+        height = int(values["HEIGHT"])
     except ValueError:
-        error("WIDTH and HEIGHT must be integers value ;)")
+        raise ConfigError("WIDTH and HEIGHT must be integers value ;)")
+
+    if width <= 0 or height <= 0:
+        raise ConfigError("WIDTH and HEIGHT must be > 0")
+    if width < 10 or height < 10:
+        raise ConfigError("Sorry the maze too small to display " +
+                          "the entire 42 pattern :(")
+    entry = _point(values["ENTRY"], width, height, "entry")
+    exit = _point(values["EXIT"], width, height, "exit")
+    if entry == exit:
+        raise ConfigError(
+            "The entry point and exit cannot be at the same place")
+    perfect = _boolean(values, "PERFECT", False,
+                       "PERFECT must be True or False Only ;)")
+
+    output_file = values["OUTPUT_FILE"]
+    if not output_file:
+        raise ConfigError("no output file has been added ;)")
+    if not output_file[0].isalpha():
+        raise ConfigError("Wrong file name ! (ex: maze.txt)")
+
+    seed = None
+    if "SEED" in values:
+        try:
+            seed = int(values["SEED"])
+        except ValueError:
+            raise ConfigError("SEED must be an integer")
+        if not -2 ** 63 <= seed < 2 ** 63:
+            raise ConfigError("SEED must fit in a signed 64-bit integer")
 
-    if config["WIDTH"] <= 0 or config["HEIGHT"] <= 0:
-        error("WIDTH and HEIGHT must be > 0")
-    if config["WIDTH"] < 10 or config["HEIGHT"] < 10:
-        error("Sorry the maze too small to display " +
-              "the entire 42 pattern :(")
-    try:
-        ex, ey = config["ENTRY"].split(",")
-        config["ENTRY"] = (int(ex), int(ey))
-
-        xi, yi = config["EXIT"].split(",")
-        config["EXIT"] = (int(xi), int(yi))
-        if (
-            int(ex) < 0
-            or int(ex) >= config["WIDTH"]
-            or int(ey) < 0
-            or int(ey) >= config["HEIGHT"]
-        ):
-            error("the entry points are out of range")
-        if (
-            int(xi) < 0
-            or int(xi) >= config["WIDTH"]
-            or int(yi) < 0
-            or int(yi) >= config["HEIGHT"]
-        ):
-            error("the exit points are out of range")
+    animate = _boolean(values, "ANIMATE", True,
+                       "The ANIMATE value must be true or false :(")
 
-    except ValueError:
-        error("ENTRY and EXIT must be in format x,y")
-
-    if config["ENTRY"] == config["EXIT"]:
-        error("The entry point and exit cannot be at the same place")
-    if config["PERFECT"].lower() == "true":
-        config["PERFECT"] = True
-    elif config["PERFECT"].lower() == "false":
-        config["PERFECT"] = False
-    else:
-        error("PERFECT must be True or False Only ;)")
-
-    if not config["OUTPUT_FILE"]:
-        error("no output file has been added ;)")
-    if not config["OUTPUT_FILE"][0].isalpha():
-        error("Wrong file name ! (ex: maze.txt)")
-
-    if "SEED" in config:
+    braid = 0.1
+    if "BRAID" in values:
         try:
-            config["SEED"] = int(config["SEED"])
+            braid = float(values["BRAID"])
         except ValueError:
-            error("SEED must be an integer")
-    else:
-        config["SEED"] = None
-
-    if "ANIMATE" in config:
-        if config["ANIMATE"].lower() == "true":
-            config["ANIMATE"] = True
-        elif config["ANIMATE"].lower() == "false":
-            config["ANIMATE"] = False
-        else:
-            error("The ANIMATE value must be true or false :(")
-    else:
-        config["ANIMATE"] = True
-
-    return config
+            raise ConfigError("BRAID must be a number between 0 and 1")
+        if not 0 <= braid <= 1:
+            raise ConfigError("BRAID must be a number between 0 and 1")
+
+    profile = _boolean(values, "PROFILE", False,
+                       "The PROFILE value must be true or false :(")
+
+    try:
+        cache_size = int(values.get("CACHE_SIZE", 64))
+    except ValueError:
+        raise ConfigError(
+            "CACHE_SIZE must be an integer number of megabytes")
+
+    output_format = values.get("OUTPUT_FORMAT", "hex").lower()
+    if output_format not in ("hex", "packed"):
+        raise ConfigError("OUTPUT_FORMAT must be hex or packed")
+
+    return MazeConfig(
+        width, height, entry, exit, output_file, perfect, seed, animate,
+        braid, profile, values.get("PROFILE_FILE") or "profile.json",
+        values.get("CACHE_DIR") or None, cache_size, output_format,
+        values.get("PATTERN") or None)
+
+
+def load_config(path: str) -> MazeConfig:
+    """Read and validate the maze configuration file ``path``, raising
+    OSError if it cannot be read and ConfigError if it is invalid."""
+    with open(path, "r") as file:
+        return parse_config_text(file.read())
+
+
+def read_config(filename: str | None = None) -> MazeConfig:
+    """ Read and validate the maze configuration file, taken from the
+    command line when ``filename`` is not given, exiting with an error
+    message when it is unusable."""
+    if filename is None:
+        if len(sys.argv) != 2:
+            error("Usage: python3 a_maze_ing.py config.txt")
+        filename = sys.argv[1]
+    try:
+        return load_config(filename)
+    except (FileNotFoundError, PermissionError, IsADirectoryError):
+        error(f"Cannot open config file: {filename}")
+    except ConfigError as problem:
+        error(str(problem))
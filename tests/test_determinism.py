@@ -0,0 +1,48 @@
+import pytest
+
+from mazegen import MazeGenerator
+from mazegen.solvers import OPEN_COUNT
+from mazegen.vectorized import HAVE_NUMPY, VECTORIZED_ALGOS
+
+
+ENGINES = ["dfs", "prim", "eller", "wilson"] + [
+    pytest.param(algo, marks=pytest.mark.skipif(
+        not HAVE_NUMPY, reason="numpy is not installed"))
+    for algo in VECTORIZED_ALGOS
+]
+
+
+def build(algo: str, perfect: bool, seed: int = 42) -> MazeGenerator:
+    """Return a 25 x 20 maze generated with ``algo`` and ``seed``."""
+    maze = MazeGenerator(25, 20, (0, 0), (24, 19), perfect, seed)
+    maze.generate(algo)
+    return maze
+
+
+@pytest.mark.parametrize("perfect", [True, False])
+@pytest.mark.parametrize("algo", ENGINES)
+def test_same_seed_same_cells(algo: str, perfect: bool) -> None:
+    first = build(algo, perfect)
+    second = build(algo, perfect)
+    assert first.cells == second.cells
+    assert first.Generate_solution_bfs() == second.Generate_solution_bfs()
+
+
+@pytest.mark.parametrize("algo", ENGINES)
+def test_regenerate_matches_fresh_maze(algo: str) -> None:
+    maze = build("dfs", False, seed=1)
+    maze.regenerate(42, algo)
+    assert maze.cells == build(algo, False).cells
+
+
+@pytest.mark.parametrize("algo", ENGINES)
+def test_generate_again_gives_one_tree(algo: str) -> None:
+    maze = build(algo, True)
+    maze.generate(algo)
+    openings = sum(maze.cells.translate(OPEN_COUNT)) // 2
+    assert openings == len(maze.cells) - maze.mask.count(1) - 1
+
+
+@pytest.mark.parametrize("algo", ENGINES)
+def test_other_seed_other_cells(algo: str) -> None:
+    assert build(algo, True).cells != build(algo, True, seed=43).cells
@@ -0,0 +1,100 @@
+import io
+
+import pytest
+
+from mazegen import MazeGenerator
+from mazegen.loader import load_hex
+
+
+def written(perfect: bool = True) -> tuple[MazeGenerator, bytes]:
+    """Return a generated 12 x 10 maze and its hexadecimal file."""
+    maze = MazeGenerator(12, 10, (0, 0), (11, 9), perfect, 7)
+    maze.generate("dfs")
+    output = io.StringIO()
+    maze.write_hex(output,
+                   maze.Drawing_solution_path(maze.Generate_solution_bfs()))
+    return maze, output.getvalue().encode("ascii")
+
+
+def with_solution(data: bytes, solution: bytes) -> bytes:
+    """Replace the solution line of a maze file."""
+    return data[:data.rindex(b"\n") + 1] + solution
+
+
+@pytest.mark.parametrize("perfect", [True, False])
+def test_round_trip(perfect: bool) -> None:
+    maze, data = written(perfect)
+    loaded, path = load_hex(data)
+    assert loaded.cells == maze.cells
+    assert (loaded.entry, loaded.exit) == (maze.entry, maze.exit)
+    assert loaded.perfect == perfect
+    assert path == maze.Generate_solution_bfs()
+
+
+def test_rejects_missing_blank_line() -> None:
+    _, data = written()
+    with pytest.raises(ValueError, match="empty line"):
+        load_hex(data.replace(b"\n\n", b"\n"))
+
+
+def test_rejects_uneven_rows() -> None:
+    _, data = written()
+    with pytest.raises(ValueError, match="equal width"):
+        load_hex(data[1:])
+
+
+def test_rejects_missing_exit_line() -> None:
+    _, data = written()
+    with pytest.raises(ValueError, match="entry or exit"):
+        load_hex(data[:data.index(b"\n\n") + 2] + b"0,0")
+
+
+def test_rejects_non_hex_digit() -> None:
+    _, data = written()
+    with pytest.raises(ValueError, match="hexadecimal"):
+        load_hex(b"\t" + data[1:])
+
+
+def test_rejects_exit_outside_grid() -> None:
+    _, data = written()
+    with pytest.raises(ValueError, match="outside"):
+        load_hex(data.replace(b"\n11,9\n", b"\n12,9\n"))
+
+
+def test_rejects_open_outer_wall() -> None:
+    maze, _ = written()
+    maze.remove_wall(0, 0, "N")
+    output = io.StringIO()
+    maze.write_hex(output, [])
+    with pytest.raises(ValueError, match="outer walls"):
+        load_hex(output.getvalue().encode("ascii"))
+
+
+def test_rejects_inconsistent_wall() -> None:
+    maze, _ = written()
+    maze.cells[0] ^= 0b0010
+    output = io.StringIO()
+    maze.write_hex(output, [])
+    with pytest.raises(ValueError, match="inconsistent wall"):
+        load_hex(output.getvalue().encode("ascii"))
+
+
+@pytest.mark.parametrize("validate", [True, False])
+def test_rejects_unknown_move(validate: bool) -> None:
+    _, data = written()
+    with pytest.raises(ValueError, match="unknown move"):
+        load_hex(with_solution(data, b"SX"), validate)
+
+
+def test_rejects_move_through_wall() -> None:
+    maze, data = written()
+    blocked = next(move for move, bit in ((b"E", 0b0010), (b"S", 0b0100))
+                   if maze.cells[0] & bit)
+    with pytest.raises(ValueError, match="crosses a wall"):
+        load_hex(with_solution(data, blocked))
+
+
+def test_rejects_move_off_the_grid() -> None:
+    _, data = written()
+    with pytest.raises(ValueError, match="leaves the maze"):
+        load_hex(with_solution(data, b"N"))